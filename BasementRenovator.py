@@ -29,7 +29,6 @@
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
-from copy import deepcopy
 
 import traceback
 import sys
@@ -41,15 +40,19 @@ import re
 import shutil
 import datetime
 import random
+import functools
 import urllib.parse
 import urllib.request
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.cElementTree as ET
-import psutil
 
+# psutil is only needed for killing the game when testing, it's imported where it's
+# used to keep it out of startup
 import src.roomconvert as StageConvert
 from src.core import Room as RoomData, Entity as EntityData
 from src.lookup import EntityLookup, MainLookup
+from src.entitiesgenerator import parseModXML, ModXMLParseError
 import src.anm2 as anm2
 from src.constants import *
 from src.util import *
@@ -83,14 +86,17 @@ def getSteamPath():
 
 def findInstallPath():
     version = getGameVersion()
-    if version == "Antibirth" and settings.value("AntibirthPath"):
-        return settings.value("AntibirthPath")
+    if version == "Antibirth":
+        antibirthPath = settings.value("AntibirthPath")
+        if antibirthPath:
+            return antibirthPath
 
     installPath = ""
     cantFindPath = False
 
-    if QFile.exists(settings.value("InstallFolder")):
-        installPath = settings.value("InstallFolder")
+    installFolder = settings.value("InstallFolder")
+    if QFile.exists(installFolder):
+        installPath = installFolder
 
     else:
         # Windows path things
@@ -105,29 +111,13 @@ def findInstallPath():
                 if not QFile.exists(installPath):
                     cantFindPath = True
 
-                    libconfig = os.path.join(
-                        basePath, "steamapps", "libraryfolders.vdf"
-                    )
-                    if os.path.isfile(libconfig):
-                        libLines = list(open(libconfig, "r"))
-                        matcher = re.compile(r'"\d+"\s*"(.*?)"')
-                        installDirs = map(
-                            lambda res: os.path.normpath(res.group(1)),
-                            filter(
-                                lambda res: res,
-                                map(lambda line: matcher.search(line), libLines),
-                            ),
+                    for root in steamLibraryFolders(basePath):
+                        installPath = os.path.join(
+                            root, "steamapps", "common", "The Binding of Isaac Rebirth"
                         )
-                        for root in installDirs:
-                            installPath = os.path.join(
-                                root,
-                                "steamapps",
-                                "common",
-                                "The Binding of Isaac Rebirth",
-                            )
-                            if QFile.exists(installPath):
-                                cantFindPath = False
-                                break
+                        if QFile.exists(installPath):
+                            cantFindPath = False
+                            break
 
         # Mac Path things
         elif "Darwin" in platform.system():
@@ -163,23 +153,14 @@ def findModsPath(installPath=None):
     modsPath = ""
     cantFindPath = False
 
-    if QFile.exists(settings.value("ModsFolder")):
-        modsPath = settings.value("ModsFolder")
+    modsFolder = settings.value("ModsFolder")
+    if QFile.exists(modsFolder):
+        modsPath = modsFolder
 
     else:
         installPath = installPath or findInstallPath()
         if len(installPath) > 0:
-            modDirectory = os.path.join(installPath, "savedatapath.txt")
-            if os.path.isfile(modDirectory):
-                lines = list(open(modDirectory, "r"))
-                modDirs = list(
-                    filter(
-                        lambda parts: parts[0] == "Modding Data Path",
-                        map(lambda line: line.split(": "), lines),
-                    )
-                )
-                if len(modDirs) > 0:
-                    modsPath = os.path.normpath(modDirs[0][1].strip())
+            modsPath = readModdingDataPath(installPath) or ""
 
     if modsPath == "" or not os.path.isdir(modsPath):
         cantFindPath = True
@@ -269,7 +250,11 @@ def loadMods(autogenerate, installPath, resourcePath):
         printf("Could not find Mods Folder! Skipping mod content!")
         return
 
-    modsInstalled = os.listdir(modsPath)
+    # the directory listing already knows which entries are folders, no need to stat them again
+    with os.scandir(modsPath) as entries:
+        modsInstalled = [
+            (entry.name, entry.path) for entry in entries if entry.is_dir()
+        ]
 
     autogenPath = "resources/Entities/ModTemp"
     if autogenerate and not os.path.exists(autogenPath):
@@ -277,14 +262,11 @@ def loadMods(autogenerate, installPath, resourcePath):
 
     printSectionBreak()
     printf("LOADING MOD CONTENT")
-    for mod in modsInstalled:
-        modPath = os.path.join(modsPath, mod)
+    for mod, modPath in modsInstalled:
         brPath = os.path.join(modPath, "basementrenovator")
 
         # Make sure we're a mod
-        if not os.path.isdir(modPath) or os.path.isfile(
-            os.path.join(modPath, "disable.it")
-        ):
+        if os.path.isfile(os.path.join(modPath, "disable.it")):
             continue
 
         # simple workaround for now
@@ -294,10 +276,9 @@ def loadMods(autogenerate, installPath, resourcePath):
         # Get the mod name
         modName = mod
         try:
-            tree = ET.parse(os.path.join(modPath, "metadata.xml"))
-            root = tree.getroot()
+            root = parseModXML(os.path.join(modPath, "metadata.xml"))
             modName = root.find("name").text
-        except ET.ParseError:
+        except ModXMLParseError:
             printf(
                 f'Failed to parse mod metadata "{modName}", falling back on default name'
             )
@@ -311,26 +292,38 @@ def loadMods(autogenerate, installPath, resourcePath):
 
 
 class RoomScene(QGraphicsScene):
+    GRID_PEN = QPen(QColor.fromRgb(255, 255, 255, 100), 1, Qt.DashLine)
+    OUT_OF_BOUNDS_GRID_PEN = QPen(QColor.fromRgb(100, 255, 255, 100), 1, Qt.DashLine)
+    INACTIVE_BRUSH = QBrush(QColor(255, 255, 255, 100))
+    FRAME_CACHE_LIMIT = 65536  # in KB
+
     def __init__(self, parent):
         QGraphicsScene.__init__(self, 0, 0, 0, 0)
+
+        # entities move around constantly and tile lookups go through roomRows/entCache,
+        # so keeping Qt's bsp tree up to date on every move only costs time
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+
         self.newRoomSize(1)
+        self.loadDisplaySettings()
 
         # Make the bitfont
         q = QImage()
         q.load("resources/UI/Bitfont.png")
 
-        self.bitfont = [
-            QPixmap.fromImage(q.copy(i * 12, j * 12, 12, 12))
-            for j in range(int(q.height() / 12))
-            for i in range(int(q.width() / 12))
-        ]
+        # glyphs are 12x12 cells in a single atlas, getBitfontFragment makes fragments
+        # for them that are drawn in batches with drawPixmapFragments
+        self.bitfont = QPixmap.fromImage(q)
+        self.bitfontColumns = q.width() // 12
         self.bitText = True
 
         self.roomDoorRoot = None
         self.clearDoors()
 
         self.bgState = []
-        self.framecache = {}
+
+        # rendered pit/rock frames, bounded so long sessions don't accumulate them forever
+        QPixmapCache.setCacheLimit(RoomScene.FRAME_CACHE_LIMIT)
 
         self.floorAnim = anm2.Config(
             "resources/Backgrounds/FloorBackdrop.anm2", "resources"
@@ -340,6 +333,24 @@ class RoomScene(QGraphicsScene):
             "resources/Backgrounds/WallBackdrop.anm2", "resources"
         )
         self.wallImg = None
+        self.bgPixmap = None
+
+    def getBitfontFragment(self, x, y, index):
+        """Makes a fragment drawing the glyph at index with its top left at x, y"""
+        cols = self.bitfontColumns
+        # fragments are positioned by their center
+        return QPainter.PixmapFragment.create(
+            QPointF(x + 6, y + 6),
+            QRectF((index % cols) * 12, (index // cols) * 12, 12, 12),
+        )
+
+    def clear(self):
+        QGraphicsScene.clear(self)
+        # the row widgets are deleted with everything else
+        self.roomRows = []
+        for stack in self.entCache:
+            stack.clear()
+        self.entCacheDirty = True
 
     def newRoomSize(self, shape):
         self.roomInfo = Room.Info(shape=shape)
@@ -348,6 +359,10 @@ class RoomScene(QGraphicsScene):
 
         self.roomWidth, self.roomHeight = self.roomInfo.dims
         self.entCache = [[] for i in range(self.roomWidth * self.roomHeight)]
+        self.stackedCells = []
+        self.entCacheDirty = True
+
+        self.buildGrid()
 
         self.roomRows = [QGraphicsWidget() for i in range(self.roomHeight)]
         for _, row in enumerate(self.roomRows):
@@ -357,6 +372,44 @@ class RoomScene(QGraphicsScene):
             -1 * 26, -1 * 26, (self.roomWidth + 2) * 26, (self.roomHeight + 2) * 26
         )
 
+    def buildGrid(self):
+        """Precomputes the grid lines and labels drawn in the foreground, split by whether they're in bounds"""
+        gs = 26
+
+        self.gridLines = []
+        self.outOfBoundsGridLines = []
+        self.gridLabels = []
+        self.outOfBoundsGridLabels = []
+
+        for y in range(self.roomHeight):
+            for x in range(self.roomWidth):
+                if self.roomInfo.isInBounds(x, y):
+                    lines, labels = self.gridLines, self.gridLabels
+                else:
+                    lines, labels = (
+                        self.outOfBoundsGridLines,
+                        self.outOfBoundsGridLabels,
+                    )
+
+                left, top = x * gs, y * gs
+                right, bottom = left + gs, top + gs
+                lines.extend(
+                    (
+                        QLineF(left, top, right, top),
+                        QLineF(left, bottom, right, bottom),
+                        QLineF(left, top, left, bottom),
+                        QLineF(right, top, right, bottom),
+                    )
+                )
+                labels.append(
+                    (
+                        left + 2,
+                        top,
+                        f"{Room.Info.gridIndex(x, y, self.roomWidth)}",
+                        f"{x - 1},{y - 1}",
+                    )
+                )
+
     def updateRoomDepth(self, room):
         if room.roomBG.get("InvertDepth") != "1":
             for i, row in enumerate(self.roomRows):
@@ -366,52 +419,82 @@ class RoomScene(QGraphicsScene):
             for i, row in enumerate(self.roomRows):
                 row.setZValue(last - i)
 
-    def getAdjacentEnts(self, x, y, useCache=False):
+    def addToEntCache(self, ent):
+        e = ent.entity
+        self.entCache[e.y * self.roomWidth + e.x].append(ent)
+        self.entCacheDirty = True
+
+    def removeFromEntCache(self, ent):
+        e = ent.entity
+        stack = self.entCache[e.y * self.roomWidth + e.x]
+        if ent in stack:
+            stack.remove(ent)
+        self.entCacheDirty = True
+
+    def updateEntCache(self):
+        # entCache itself is kept current as entities are added, moved, and removed;
+        # the stack counter's summary of it is only rebuilt when something changed since the last paint
+        if not self.entCacheDirty:
+            return
+        self.entCacheDirty = False
+
+        # the few tiles with stacks on them, for the stack counter
+        self.stackedCells = [
+            (idx, len(stack))
+            for idx, stack in enumerate(self.entCache)
+            if len(stack) > 1
+        ]
+
+    def getEntitiesAt(self, x, y):
+        if x < 0 or x >= self.roomWidth or y < 0 or y >= self.roomHeight:
+            return []
+
+        return list(self.entCache[y * self.roomWidth + x])
+
+    def getAdjacentEnts(self, x, y):
         width, height = self.roomWidth, self.roomHeight
 
-        # [ L, R, U, D, UL, DL, UR, DR ]
-        lookup = {
-            -1: [4, 2, 6],
-            0: [0, None, 1],
-            1: [5, 3, 7],
-        }
+        # neighbors are read straight out of the per-tile cache
+        cache = self.entCache
 
+        # [ L, R, U, D, UL, DL, UR, DR ]
         res = [[] for i in range(8)]
-        if useCache:
-            for i in range(-1, 2):
-                for j in range(-1, 2):
-                    spot = lookup[i][j + 1]
-                    if spot is not None:
-                        idx = Room.Info.gridIndex(x + j, y + i, width)
-                        if idx < 0 or idx >= width * height:
-                            continue
-                        res[spot] = self.entCache[idx]
-            return res
-
-        for yc in [y - 1, y, y + 1]:
-            if yc < 0 or yc >= height:
-                continue
-
-            for item in self.roomRows[yc].childItems():
-                xc = item.entity.x
-                i = (xc - x) + 1
-                if i > -1 and i < 3:
-                    spots = lookup[yc - y]
-                    if spots[i] is not None:
-                        res[spots[i]].append(item)
+        base = Room.Info.gridIndex(x, y, width)
+        hasLeft, hasRight = x > 0, x < width - 1
+
+        if y > 0:
+            up = base - width
+            res[2] = cache[up]
+            if hasLeft:
+                res[4] = cache[up - 1]
+            if hasRight:
+                res[6] = cache[up + 1]
+
+        if hasLeft:
+            res[0] = cache[base - 1]
+        if hasRight:
+            res[1] = cache[base + 1]
+
+        if y < height - 1:
+            down = base + width
+            res[3] = cache[down]
+            if hasLeft:
+                res[5] = cache[down - 1]
+            if hasRight:
+                res[7] = cache[down + 1]
 
         return res
 
     def getFrame(self, key, anm2):
-        cache = self.framecache.get(key)
-        if not cache:
-            cache = {}
-            self.framecache[key] = cache
-
-        frame = cache.get(anm2.frame)
+        cacheKey = f"{key}:{anm2.frame}"
+        frame = QPixmapCache.find(cacheKey)
         if frame is None:
-            frame = anm2.render()
-            cache[anm2.frame] = frame
+            img = anm2.render()
+            if img is None:
+                return None
+
+            frame = QPixmap.fromImage(img)
+            QPixmapCache.insert(cacheKey, frame)
 
         return frame
 
@@ -427,55 +510,58 @@ class RoomScene(QGraphicsScene):
         self.roomDoorRoot.setZValue(-1000)  # make sure doors display under entities
         self.addItem(self.roomDoorRoot)
 
+    def loadDisplaySettings(self):
+        """Caches the grid display and placement settings, call again whenever they change"""
+        self.snapToBounds = settings.value("SnapToBounds") == "1"
+        self.showStatus = settings.value("StatusEnabled") != "0"
+        self.useBitfont = settings.value("BitfontEnabled") != "0"
+        self.showGrid = settings.value("GridEnabled") != "0"
+        self.showOutOfBoundsGrid = settings.value("BoundsGridEnabled") == "1"
+        self.showGridIndex = settings.value("ShowGridIndex") == "1"
+        self.showCoordinates = settings.value("ShowCoordinates") == "1"
+
     def drawForeground(self, painter, rect):
 
         # Bitfont drawing: moved to the RoomEditorWidget.drawForeground for easier anti-aliasing
 
         # Grey out the screen to show it's inactive if there are no rooms selected
         if mainWindow.roomList.selectedRoom() is None:
-            b = QBrush(QColor(255, 255, 255, 100))
             painter.setPen(Qt.white)
-            painter.setBrush(b)
+            painter.setBrush(RoomScene.INACTIVE_BRUSH)
 
-            painter.fillRect(rect, b)
+            painter.fillRect(rect, RoomScene.INACTIVE_BRUSH)
             return
 
-        if settings.value("GridEnabled") == "0":
+        if not self.showGrid:
             return
 
-        gs = 26
+        showOutOfBounds = self.showOutOfBoundsGrid
+        showGridIndex = self.showGridIndex
+        showCoordinates = self.showCoordinates
 
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
 
-        white = QColor.fromRgb(255, 255, 255, 100)
-        bad = QColor.fromRgb(100, 255, 255, 100)
-
-        showOutOfBounds = settings.value("BoundsGridEnabled") == "1"
-        showGridIndex = settings.value("ShowGridIndex") == "1"
-        showCoordinates = settings.value("ShowCoordinates") == "1"
-        for y in range(self.roomHeight):
-            for x in range(self.roomWidth):
-                if self.roomInfo.isInBounds(x, y):
-                    painter.setPen(QPen(white, 1, Qt.DashLine))
-                else:
-                    if not showOutOfBounds:
-                        continue
-                    painter.setPen(QPen(bad, 1, Qt.DashLine))
-
-                painter.drawLine(x * gs, y * gs, (x + 1) * gs, y * gs)
-                painter.drawLine(x * gs, (y + 1) * gs, (x + 1) * gs, (y + 1) * gs)
-                painter.drawLine(x * gs, y * gs, x * gs, (y + 1) * gs)
-                painter.drawLine((x + 1) * gs, y * gs, (x + 1) * gs, (y + 1) * gs)
+        painter.setPen(RoomScene.GRID_PEN)
+        painter.drawLines(self.gridLines)
+        if showOutOfBounds:
+            painter.setPen(RoomScene.OUT_OF_BOUNDS_GRID_PEN)
+            painter.drawLines(self.outOfBoundsGridLines)
+
+        if showGridIndex or showCoordinates:
+            labelSets = [(RoomScene.GRID_PEN, self.gridLabels)]
+            if showOutOfBounds:
+                labelSets.append(
+                    (RoomScene.OUT_OF_BOUNDS_GRID_PEN, self.outOfBoundsGridLabels)
+                )
 
-                if showGridIndex:
-                    painter.drawText(
-                        x * gs + 2,
-                        y * gs + 13,
-                        f"{Room.Info.gridIndex(x, y, self.roomWidth)}",
-                    )
-                if showCoordinates:
-                    painter.drawText(x * gs + 2, y * gs + 24, f"{x - 1},{y - 1}")
+            for pen, labels in labelSets:
+                painter.setPen(pen)
+                for x, y, gridIndex, coordinates in labels:
+                    if showGridIndex:
+                        painter.drawText(x, y + 13, gridIndex)
+                    if showCoordinates:
+                        painter.drawText(x, y + 24, coordinates)
 
         # Draw Walls (Debug)
         # painter.setPen(QPen(Qt.green, 5, Qt.SolidLine))
@@ -498,7 +584,7 @@ class RoomScene(QGraphicsScene):
             roomShape = 1
 
         bgState = [roomBG, roomShape]
-        if bgState == self.bgState[:1]:
+        if bgState == self.bgState[:2]:
             return
 
         self.bgState = bgState
@@ -529,33 +615,53 @@ class RoomScene(QGraphicsScene):
         self.wallImg = self.wallAnim.render()
 
         self.roomShape = roomShape
-
-    def getBGGfxData(self):
-        return self.bgState[2] if self.bgState else None
-
-    def drawBackground(self, painter, rect):
-
-        self.loadBackground()
+        self.bgPixmap = self.composeBackground()
 
         xOff, yOff = 0, 0
-        shapeData = RoomData.Shapes[self.roomShape]
+        shapeData = RoomData.Shapes[roomShape]
         if shapeData.get("TopLeft"):
             xOff, yOff = RoomData.Info.coords(
                 shapeData["TopLeft"], shapeData["Dims"][0]
             )
 
         gs = 26
-        painter.drawImage((1 + xOff) * gs, (1 + yOff) * gs, self.floorImg)
-        painter.drawImage((-1 + xOff) * gs, (-1 + yOff) * gs, self.wallImg)
+        self.bgPos = QPoint((-1 + xOff) * gs, (-1 + yOff) * gs)
 
-        for stack in self.entCache:
-            stack.clear()
+    def composeBackground(self):
+        """Flattens the floor and walls into a single pixmap, drawn at the wall origin"""
+        gs = 26
+        layers = [
+            (img, offset)
+            for img, offset in ((self.wallImg, 0), (self.floorImg, 2 * gs))
+            if img is not None
+        ]
+        if not layers:
+            return None
+
+        width = max(img.width() + offset for img, offset in layers)
+        height = max(img.height() + offset for img, offset in layers)
+
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        for img, offset in layers:
+            painter.drawImage(offset, offset, img)
+        painter.end()
+
+        return pixmap
+
+    def getBGGfxData(self):
+        return self.bgState[2] if self.bgState else None
 
-        for item in self.items():
-            if isinstance(item, Entity):
-                xc = item.entity.x
-                yc = item.entity.y
-                self.entCache[Room.Info.gridIndex(xc, yc, self.roomWidth)].append(item)
+    def drawBackground(self, painter, rect):
+
+        self.loadBackground()
+
+        if self.bgPixmap:
+            painter.drawPixmap(self.bgPos, self.bgPixmap)
+
+        self.updateEntCache()
 
         # have to set rock tiling ahead of time due to render order not being guaranteed left to right
         room = mainWindow.roomList.selectedRoom()
@@ -570,9 +676,27 @@ class RoomScene(QGraphicsScene):
 
 
 class RoomEditorWidget(QGraphicsView):
+    STATUS_PEN = QPen(Qt.white, 1, Qt.SolidLine)
+
     def __init__(self, scene, parent=None):
         super(RoomEditorWidget, self).__init__(parent)
 
+        # status overlay resources, built once rather than every paint
+        self.statusTitleFont = QFont(self.viewport().font())
+        self.statusTitleFont.setPixelSize(13)
+        self.statusInfoFont = QFont(self.viewport().font())
+        self.statusInfoFont.setPixelSize(10)
+        self.roomTypeIcons = {}
+        # laid out once per stack count for the non-bitfont counters
+        self.stackCountTexts = {}
+
+        # the overlay only changes with the room, the selection or an edit, so it's drawn once and blitted
+        self.statusOverlay = None
+        self.statusDirty = True
+
+        # items all draw with these, the painter is reset to them before each item
+        self.setRenderHints(self.renderHints() | Entity.RENDER_HINTS)
+
         self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.setTransformationAnchor(QGraphicsView.AnchorViewCenter)
@@ -604,9 +728,16 @@ class RoomEditorWidget(QGraphicsView):
         self.setScene(scene)
         self.centerOn(0, 0)
 
+        scene.selectionChanged.connect(self.invalidateStatusOverlay)
+        self.statusDirty = True
+
         self.objectToPaint = None
         self.lastTile = None
 
+        # reused across resizes, only reapplied when the scale actually changes
+        self.viewTransform = QTransform()
+        self.lastScale = None
+
     def tryToPaint(self, event):
         """Called when a paint attempt is initiated"""
 
@@ -620,25 +751,24 @@ class RoomEditorWidget(QGraphicsView):
         x = int(x / 26)
         y = int(y / 26)
 
-        xMax, yMax = self.scene().roomWidth, self.scene().roomHeight
+        scene = self.scene()
+        xMax, yMax = scene.roomWidth - 1, scene.roomHeight - 1
 
-        x = min(max(x, 0), xMax - 1)
-        y = min(max(y, 0), yMax - 1)
+        x = 0 if x < 0 else xMax if x > xMax else x
+        y = 0 if y < 0 else yMax if y > yMax else y
 
-        if settings.value("SnapToBounds") == "1":
-            x, y = self.scene().roomInfo.snapToBounds(x, y)
+        if scene.snapToBounds:
+            x, y = scene.roomInfo.snapToBounds(x, y)
 
-        for i in self.scene().items():
-            if isinstance(i, Entity):
-                if i.entity.x == x and i.entity.y == y:
-                    if i.stackDepth == EntityStack.MAX_STACK_DEPTH:
-                        return
+        for i in scene.getEntitiesAt(x, y):
+            if i.stackDepth == EntityStack.MAX_STACK_DEPTH:
+                return
 
-                    i.hideWeightPopup()
+            i.hideWeightPopup()
 
-                    # Don't stack multiple grid entities
-                    if int(i.entity.Type) > 999 and int(self.objectToPaint.ID) > 999:
-                        return
+            # Don't stack multiple grid entities
+            if int(i.entity.Type) > 999 and int(self.objectToPaint.ID) > 999:
+                return
 
         # Make sure we're not spawning oodles
         if (x, y) in self.lastTile:
@@ -698,10 +828,15 @@ class RoomEditorWidget(QGraphicsView):
         QGraphicsView.keyPressEvent(self, event)
 
     def drawBackground(self, painter, rect):
+        # the backdrop is drawn unsmoothed, the view's hints are for the items drawn after it
+        painter.setRenderHints(Entity.RENDER_HINTS, False)
+
         painter.fillRect(rect, QColor(0, 0, 0))
 
         QGraphicsView.drawBackground(self, painter, rect)
 
+        painter.setRenderHints(Entity.RENDER_HINTS)
+
     def resizeEvent(self, event):
         QGraphicsView.resizeEvent(self, event)
 
@@ -712,51 +847,75 @@ class RoomEditorWidget(QGraphicsView):
         yScale = (event.size().height() - 2) / (26 * (h + 2))
         newScale = min([xScale, yScale])
 
-        tr = QTransform()
-        tr.scale(newScale, newScale)
-
-        self.setTransform(tr)
+        if newScale != self.lastScale:
+            self.lastScale = newScale
+            self.viewTransform.reset()
+            self.viewTransform.scale(newScale, newScale)
+            self.setTransform(self.viewTransform)
 
         if newScale == yScale:
             self.setAlignment(Qt.AlignTop | Qt.AlignHCenter)
         else:
             self.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
 
+    def invalidateStatusOverlay(self):
+        self.statusDirty = True
+
     def paintEvent(self, event):
         # Purely handles the status overlay text
         QGraphicsView.paintEvent(self, event)
 
-        if settings.value("StatusEnabled") == "0":
+        if not self.scene().showStatus:
+            self.statusDirty = True
             return
 
+        viewport = self.viewport()
+        ratio = viewport.devicePixelRatioF()
+        if (
+            self.statusDirty
+            or self.statusOverlay is None
+            or self.statusOverlay.size() != viewport.size() * ratio
+        ):
+            self.statusDirty = False
+            self.statusOverlay = QPixmap(viewport.size() * ratio)
+            self.statusOverlay.setDevicePixelRatio(ratio)
+            self.statusOverlay.fill(Qt.transparent)
+            self.paintStatusOverlay(self.statusOverlay, viewport.rect())
+
+        painter = QPainter()
+        painter.begin(viewport)
+        painter.drawPixmap(0, 0, self.statusOverlay)
+        painter.end()
+
+    def paintStatusOverlay(self, target, r):
         # Display the room status in a text overlay
         painter = QPainter()
-        painter.begin(self.viewport())
+        painter.begin(target)
 
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        painter.setPen(QPen(Qt.white, 1, Qt.SolidLine))
+        painter.setPen(RoomEditorWidget.STATUS_PEN)
 
         room = mainWindow.roomList.selectedRoom()
         if room:
             # Room Type Icon
             roomTypes = xmlLookups.roomTypes.lookup(room=room, showInMenu=True)
             if len(roomTypes) > 0:
-                q = QPixmap(roomTypes[0].get("Icon"))
+                iconPath = roomTypes[0].get("Icon")
+                q = self.roomTypeIcons.get(iconPath)
+                if q is None:
+                    q = QPixmap(iconPath)
+                    self.roomTypeIcons[iconPath] = q
                 painter.drawPixmap(2, 3, q)
             else:
                 printf("Warning: Unknown room type during paintEvent:", room.getDesc())
 
             # Top Text
-            font = painter.font()
-            font.setPixelSize(13)
-            painter.setFont(font)
+            painter.setFont(self.statusTitleFont)
             painter.drawText(20, 16, f"{room.info.variant} - {room.name}")
 
             # Bottom Text
-            font = painter.font()
-            font.setPixelSize(10)
-            painter.setFont(font)
+            painter.setFont(self.statusInfoFont)
             painter.drawText(
                 8,
                 30,
@@ -768,15 +927,12 @@ class RoomEditorWidget(QGraphicsView):
 
         if len(selectedEntities) == 1:
             e = selectedEntities[0]
-            r = event.rect()
 
             # Entity Icon
             painter.drawPixmap(QRect(r.right() - 32, 2, 32, 32), e.entity.iconpixmap)
 
             # Top Text
-            font = painter.font()
-            font.setPixelSize(13)
-            painter.setFont(font)
+            painter.setFont(self.statusTitleFont)
             painter.drawText(
                 r.right() - 34 - 400,
                 2,
@@ -787,9 +943,7 @@ class RoomEditorWidget(QGraphicsView):
             )
 
             # Bottom Text
-            font = painter.font()
-            font.setPixelSize(10)
-            painter.setFont(font)
+            painter.setFont(self.statusInfoFont)
             textY = 20
             tags = e.entity.config.tagsString
             if tags != "[]":
@@ -814,16 +968,13 @@ class RoomEditorWidget(QGraphicsView):
 
         elif len(selectedEntities) > 1:
             e = selectedEntities[0]
-            r = event.rect()
 
             # Case Two: more than one type of entity
             # Entity Icon
             painter.drawPixmap(QRect(r.right() - 32, 2, 32, 32), e.entity.pixmap)
 
             # Top Text
-            font = painter.font()
-            font.setPixelSize(13)
-            painter.setFont(font)
+            painter.setFont(self.statusTitleFont)
             painter.drawText(
                 r.right() - 34 - 200,
                 2,
@@ -834,9 +985,7 @@ class RoomEditorWidget(QGraphicsView):
             )
 
             # Bottom Text
-            font = painter.font()
-            font.setPixelSize(10)
-            painter.setFont(font)
+            painter.setFont(self.statusInfoFont)
             painter.drawText(
                 r.right() - 34 - 200,
                 20,
@@ -844,7 +993,7 @@ class RoomEditorWidget(QGraphicsView):
                 12,
                 int(Qt.AlignRight | Qt.AlignBottom),
                 ", ".join(
-                    set([x.entity.config.name or "INVALID" for x in selectedEntities])
+                    {x.entity.config.name or "INVALID" for x in selectedEntities}
                 ),
             )
 
@@ -855,64 +1004,211 @@ class RoomEditorWidget(QGraphicsView):
     def drawForeground(self, painter, rect):
         QGraphicsView.drawForeground(self, painter, rect)
 
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
         # Display the number of entities on a given tile, in bitFont or regular font
-        tiles = [
-            [0 for x in range(self.scene().roomWidth)]
-            for y in range(self.scene().roomHeight)
-        ]
-        for e in self.scene().items():
-            if isinstance(e, Entity):
-                tiles[e.entity.y][e.entity.x] += 1
+        scene = self.scene()
+        scene.updateEntCache()
+        width = scene.roomWidth
 
-        useAliased = settings.value("BitfontEnabled") == "0"
+        useAliased = not scene.useBitfont
 
         if useAliased:
             painter.setPen(Qt.white)
             painter.font().setPixelSize(5)
 
-        for y, row in enumerate(tiles):
-            yc = (y + 1) * 26 - 12
+        # bitfont digits from every tile are collected and drawn in one batch
+        fragments = []
 
-            for x, count in enumerate(row):
-                if count <= 1:
-                    continue
+        for idx, count in scene.stackedCells:
+            x, y = idx % width, idx // width
 
-                if not useAliased:
-                    xc = (x + 1) * 26 - 12
+            if not useAliased:
+                xc = (x + 1) * 26 - 12
+                yc = (y + 1) * 26 - 12
 
-                    digits = [int(i) for i in str(count)]
+                digits = [int(i) for i in str(count)]
 
-                    fontrow = count == EntityStack.MAX_STACK_DEPTH and 1 or 0
+                fontrow = count == EntityStack.MAX_STACK_DEPTH and 1 or 0
 
-                    numDigits = len(digits) - 1
-                    for i, digit in enumerate(digits):
-                        painter.drawPixmap(
-                            xc - 12 * (numDigits - i),
-                            yc,
-                            self.scene().bitfont[digit + fontrow * 10],
+                numDigits = len(digits) - 1
+                for i, digit in enumerate(digits):
+                    fragments.append(
+                        scene.getBitfontFragment(
+                            xc - 12 * (numDigits - i), yc, digit + fontrow * 10
                         )
-                else:
-                    if count == EntityStack.MAX_STACK_DEPTH:
-                        painter.setPen(Qt.red)
-
-                    painter.drawText(
-                        x * 26,
-                        y * 26,
-                        26,
-                        26,
-                        int(Qt.AlignBottom | Qt.AlignRight),
-                        str(count),
                     )
+            else:
+                if count == EntityStack.MAX_STACK_DEPTH:
+                    painter.setPen(Qt.red)
+
+                text = self.stackCountTexts.get(count)
+                if text is None:
+                    text = QStaticText(str(count))
+                    text.prepare(QTransform(), painter.font())
+                    self.stackCountTexts[count] = text
+
+                # bottom right aligned within the tile
+                size = text.size()
+                painter.drawStaticText(
+                    QPointF((x + 1) * 26 - size.width(), (y + 1) * 26 - size.height()),
+                    text,
+                )
 
-                    if count == EntityStack.MAX_STACK_DEPTH:
-                        painter.setPen(Qt.white)
+                if count == EntityStack.MAX_STACK_DEPTH:
+                    painter.setPen(Qt.white)
+
+        if fragments:
+            painter.drawPixmapFragments(fragments, scene.bitfont)
+
+
+@functools.lru_cache(maxsize=4096)
+def getCachedPixmap(path):
+    """Loads an image once and shares the pixmap between every entity that uses it"""
+    return QPixmap(path)
+
+
+@functools.lru_cache(maxsize=256)
+def getCachedIcon(path):
+    """Loads an icon once and shares it between every room of that type"""
+    return QIcon(path)
+
+
+@functools.lru_cache(maxsize=256)
+def getCachedSheetIcon(path, x, y, w, h):
+    """Cuts an icon out of a UI sprite sheet once and shares it between menus"""
+    return QIcon(getCachedPixmap(path).copy(x, y, w, h))
+
+
+@functools.lru_cache(maxsize=1024)
+def getCollectiblePixmap(path):
+    """Draws an item sprite on top of the collectible pedestal"""
+    i = QImage()
+    i.load("resources/Entities/5.100.0 - Collectible.png")
+    i = i.convertToFormat(QImage.Format_ARGB32)
+
+    d = QImage()
+    d.load(path)
+
+    p = QPainter(i)
+    p.drawImage(0, 0, d)
+    p.end()
+
+    return QPixmap.fromImage(i)
+
+
+def computePitFrame(L, R, U, D, UL, DL, UR, DR, hasExtraFrames):
+    """Picks the pit tile frame for a combination of neighboring pits"""
+    # copied from stageapi
+    # Words were shortened to make writing code simpler.
+    F = 0  # Sprite frame to set
+
+    # First bitwise frames (works for all combinations of just left up right and down)
+    if L:
+        F = F | 1
+    if U:
+        F = F | 2
+    if R:
+        F = F | 4
+    if D:
+        F = F | 8
+
+    # Then a bunch of other combinations
+    if U and L and not UL and not R and not D:
+        F = 17
+    if U and R and not UR and not L and not D:
+        F = 18
+    if L and D and not DL and not U and not R:
+        F = 19
+    if R and D and not DR and not L and not U:
+        F = 20
+    if L and U and R and D and not UL:
+        F = 21
+    if L and U and R and D and not UR:
+        F = 22
+    if U and R and D and not L and not UR:
+        F = 25
+    if L and U and D and not R and not UL:
+        F = 26
+    if hasExtraFrames:
+        if U and L and D and UL and not DL:
+            F = 35
+        if U and R and D and UR and not DR:
+            F = 36
+
+    if L and U and R and D and not DL and not DR:
+        F = 24
+    if L and U and R and D and not UR and not UL:
+        F = 23
+    if L and U and R and UL and not UR and not D:
+        F = 27
+    if L and U and R and UR and not UL and not D:
+        F = 28
+    if L and U and R and not D and not UR and not UL:
+        F = 29
+    if L and R and D and DL and not U and not DR:
+        F = 30
+    if L and R and D and DR and not U and not DL:
+        F = 31
+    if L and R and D and not U and not DL and not DR:
+        F = 32
+
+    if hasExtraFrames:
+        if U and R and D and not L and not UR and not DR:
+            F = 33
+        if U and L and D and not R and not UL and not DL:
+            F = 34
+        if U and R and D and L and UL and UR and DL and not DR:
+            F = 37
+        if U and R and D and L and UL and UR and DR and not DL:
+            F = 38
+        if U and R and D and L and not UL and not UR and not DR and not DL:
+            F = 39
+        if U and R and D and L and DL and DR and not UL and not UR:
+            F = 40
+        if U and R and D and L and DL and UR and not UL and not DR:
+            F = 41
+        if U and R and D and L and UL and DR and not DL and not UR:
+            F = 42
+        if U and R and D and L and UL and not DL and not UR and not DR:
+            F = 43
+        if U and R and D and L and UR and not UL and not DL and not DR:
+            F = 44
+        if U and R and D and L and DL and not UL and not UR and not DR:
+            F = 45
+        if U and R and D and L and DR and not UL and not UR and not DL:
+            F = 46
+        if U and R and D and L and DL and DR and not UL and not UR:
+            F = 47
+        if U and R and D and L and DL and UL and not UR and not DR:
+            F = 48
+        if U and R and D and L and DR and UR and not UL and not DL:
+            F = 49
+
+    return F
 
 
 class Entity(QGraphicsItem):
     GRID_SIZE = 26
+    RENDER_HINTS = QPainter.Antialiasing | QPainter.SmoothPixmapTransform
+    # the corners of the grid space, drawn for selected and offset entities
+    GRID_BORDER_LINES = [
+        QLine(0, 0, 0, 4),
+        QLine(0, 0, 4, 0),
+        QLine(26, 0, 26, 4),
+        QLine(26, 0, 22, 0),
+        QLine(0, 26, 4, 26),
+        QLine(0, 26, 0, 22),
+        QLine(26, 26, 22, 26),
+        QLine(26, 26, 26, 22),
+    ]
+
+    # pit frames for every combination of neighbors, indexed by [hasExtraFrames][neighbor bits]
+    PIT_FRAMES = tuple(
+        bytes(
+            computePitFrame(*((mask >> bit) & 1 for bit in range(8)), hasExtraFrames)
+            for mask in range(256)
+        )
+        for hasExtraFrames in (False, True)
+    )
 
     class Info:
         def __init__(self, x=0, y=0, t=0, v=0, s=0, weight=0, changeAtStart=True):
@@ -938,6 +1234,7 @@ class Entity(QGraphicsItem):
             self.iconpixmap = None
             self.overlaypixmap = None
             self.known = False
+            self.outOfRange = False
 
             self.getEntityInfo(t, v, s)
 
@@ -949,7 +1246,7 @@ class Entity(QGraphicsItem):
                     f"'Could not find Entity {entitytype}.{variant}.{subtype} for in-editor, using ?"
                 )
 
-                self.pixmap = QPixmap("resources/Entities/questionmark.png")
+                self.pixmap = getCachedPixmap("resources/Entities/questionmark.png")
                 self.iconpixmap = self.pixmap
                 self.config = xmlLookups.entities.EntityConfig()
                 return
@@ -965,38 +1262,24 @@ class Entity(QGraphicsItem):
                 entitytype == EntityType["PICKUP"]
                 and variant == PickupVariant["COLLECTIBLE"]
             ):
-                i = QImage()
-                i.load("resources/Entities/5.100.0 - Collectible.png")
-                i = i.convertToFormat(QImage.Format_ARGB32)
-
-                d = QImage()
-                d.load(self.imgPath)
-
-                p = QPainter(i)
-                p.drawImage(0, 0, d)
-                p.end()
-
-                self.pixmap = QPixmap.fromImage(i)
-
+                self.pixmap = getCollectiblePixmap(self.imgPath)
             else:
-                self.pixmap = QPixmap(self.imgPath)
+                self.pixmap = getCachedPixmap(self.imgPath)
 
             if self.imgPath != self.config.imagePath:
-                self.iconpixmap = QPixmap(self.config.imagePath)
+                self.iconpixmap = getCachedPixmap(self.config.imagePath)
             else:
                 self.iconpixmap = self.pixmap
 
+            # parsed when the entity xml was loaded
             if self.config.placeVisual:
-                parts = list(
-                    map(lambda x: x.strip(), self.config.placeVisual.split(","))
-                )
-                if len(parts) == 2 and checkFloat(parts[0]) and checkFloat(parts[1]):
-                    self.placeVisual = (float(parts[0]), float(parts[1]))
-                else:
-                    self.placeVisual = parts[0]
+                self.placeVisual = self.config.placeVisual
 
             if self.config.overlayImagePath:
-                self.overlaypixmap = QPixmap(self.config.overlayImagePath)
+                self.overlaypixmap = getCachedPixmap(self.config.overlayImagePath)
+
+            # checked once here rather than on every paint
+            self.outOfRange = self.config.isOutOfRange()
 
             self.known = True
 
@@ -1047,6 +1330,12 @@ class Entity(QGraphicsItem):
         if not hasattr(Entity, "SELECTION_PEN"):
             Entity.SELECTION_PEN = QPen(Qt.green, 1, Qt.DashLine)
             Entity.OFFSET_SELECTION_PEN = QPen(Qt.red, 1, Qt.DashLine)
+            Entity.GRID_BORDER_PEN = QPen(Qt.green)
+            Entity.NO_BRUSH = QBrush(Qt.NoBrush)
+            Entity.OFFSET_MARKER_BRUSH = QBrush(Qt.red)
+            Entity.DEFAULT_PEN = QPen(Qt.white)
+            Entity.DEFAULT_BRUSH = QBrush(Qt.Dense5Pattern)
+            Entity.UNKNOWN_FONT = QFont("Arial", 6)
             Entity.INVALID_ERROR_IMG = QPixmap("resources/UI/ent-error.png")
             Entity.OUT_OF_RANGE_WARNING_IMG = QPixmap("resources/UI/ent-warning.png")
 
@@ -1078,14 +1367,12 @@ class Entity(QGraphicsItem):
         scene = mainWindow.scene
 
         def entsInCoord(x, y):
-            return filter(
-                lambda e: e.entity.x == x and e is not self,
-                scene.roomRows[y].childItems(),
-            )
+            return [e for e in scene.getEntitiesAt(x, y) if e is not self]
 
         adding = self.parentItem() is None
         if adding:
             self.setParentItem(scene.roomRows[y])
+            scene.addToEntCache(self)
 
             if self.entity.config.gfx is not None:
                 currentRoom = mainWindow.roomList.selectedRoom()
@@ -1099,13 +1386,15 @@ class Entity(QGraphicsItem):
         moving = self.entity.x != x or self.entity.y != y
 
         if (depth < 0 and moving) or depth != z:
+            stack = entsInCoord(x, y)
+
             topOfStack = False
             if depth < 0:
-                depth = sum(1 for _ in entsInCoord(x, y))
+                depth = len(stack)
                 topOfStack = True
 
             if not topOfStack:
-                for entity in entsInCoord(x, y):
+                for entity in stack:
                     z2 = entity.zValue()
                     if z2 >= depth:
                         entity.setZValue(z2 + 1)
@@ -1121,11 +1410,13 @@ class Entity(QGraphicsItem):
 
         if moving:
             self.updateBlockedDoor(True)
+            scene.removeFromEntCache(self)
 
         self.entity.x = x
         self.entity.y = y
 
         if moving:
+            scene.addToEntCache(self)
             self.updateBlockedDoor(False)
 
     def updateBlockedDoor(self, val, countOnly=False):
@@ -1161,100 +1452,16 @@ class Entity(QGraphicsItem):
 
             return False
 
-        adjEnts = self.scene().getAdjacentEnts(
-            self.entity.x, self.entity.y, useCache=True
-        )
+        adjEnts = self.scene().getAdjacentEnts(self.entity.x, self.entity.y)
 
-        [L, R, U, D, UL, DL, UR, DR] = list(map(matchInStack, adjEnts))
-        hasExtraFrames = rendered.height() > 260
+        # [ L, R, U, D, UL, DL, UR, DR ] as bits 0-7
+        mask = 0
+        for bit, stack in enumerate(adjEnts):
+            if matchInStack(stack):
+                mask |= 1 << bit
 
-        # copied from stageapi
-        # Words were shortened to make writing code simpler.
-        F = 0  # Sprite frame to set
-
-        # First bitwise frames (works for all combinations of just left up right and down)
-        if L:
-            F = F | 1
-        if U:
-            F = F | 2
-        if R:
-            F = F | 4
-        if D:
-            F = F | 8
-
-        # Then a bunch of other combinations
-        if U and L and not UL and not R and not D:
-            F = 17
-        if U and R and not UR and not L and not D:
-            F = 18
-        if L and D and not DL and not U and not R:
-            F = 19
-        if R and D and not DR and not L and not U:
-            F = 20
-        if L and U and R and D and not UL:
-            F = 21
-        if L and U and R and D and not UR:
-            F = 22
-        if U and R and D and not L and not UR:
-            F = 25
-        if L and U and D and not R and not UL:
-            F = 26
-        if hasExtraFrames:
-            if U and L and D and UL and not DL:
-                F = 35
-            if U and R and D and UR and not DR:
-                F = 36
-
-        if L and U and R and D and not DL and not DR:
-            F = 24
-        if L and U and R and D and not UR and not UL:
-            F = 23
-        if L and U and R and UL and not UR and not D:
-            F = 27
-        if L and U and R and UR and not UL and not D:
-            F = 28
-        if L and U and R and not D and not UR and not UL:
-            F = 29
-        if L and R and D and DL and not U and not DR:
-            F = 30
-        if L and R and D and DR and not U and not DL:
-            F = 31
-        if L and R and D and not U and not DL and not DR:
-            F = 32
-
-        if hasExtraFrames:
-            if U and R and D and not L and not UR and not DR:
-                F = 33
-            if U and L and D and not R and not UL and not DL:
-                F = 34
-            if U and R and D and L and UL and UR and DL and not DR:
-                F = 37
-            if U and R and D and L and UL and UR and DR and not DL:
-                F = 38
-            if U and R and D and L and not UL and not UR and not DR and not DL:
-                F = 39
-            if U and R and D and L and DL and DR and not UL and not UR:
-                F = 40
-            if U and R and D and L and DL and UR and not UL and not DR:
-                F = 41
-            if U and R and D and L and UL and DR and not DL and not UR:
-                F = 42
-            if U and R and D and L and UL and not DL and not UR and not DR:
-                F = 43
-            if U and R and D and L and UR and not UL and not DL and not DR:
-                F = 44
-            if U and R and D and L and DL and not UL and not UR and not DR:
-                F = 45
-            if U and R and D and L and DR and not UL and not UR and not DL:
-                F = 46
-            if U and R and D and L and DL and DR and not UL and not UR:
-                F = 47
-            if U and R and D and L and DL and UL and not UR and not DR:
-                F = 48
-            if U and R and D and L and DR and UR and not UL and not DL:
-                F = 49
-
-        return F
+        hasExtraFrames = rendered.height() > 260
+        return Entity.PIT_FRAMES[hasExtraFrames][mask]
 
     def setRockFrame(self, seed):
         random.seed(seed)
@@ -1275,7 +1482,7 @@ class Entity(QGraphicsItem):
             return None
 
         [_, right, _, down, _, _, _, downRight] = self.scene().getAdjacentEnts(
-            self.entity.x, self.entity.y, useCache=True
+            self.entity.x, self.entity.y
         )
 
         candidates = []
@@ -1331,10 +1538,11 @@ class Entity(QGraphicsItem):
             xc, yc = value.x(), value.y()
 
             # TODO fix this hack, this is only needed because we don't have a scene on init
+            scene = self.scene()
             w, h = 28, 16
-            if self.scene():
-                w = self.scene().roomWidth
-                h = self.scene().roomHeight
+            if scene:
+                w = scene.roomWidth
+                h = scene.roomHeight
 
             # should be round, but python is dumb and
             # arbitrarily decides when it wants to be
@@ -1342,13 +1550,13 @@ class Entity(QGraphicsItem):
             x = int(xc / Entity.GRID_SIZE + 0.5)
             y = int(yc / Entity.GRID_SIZE + 0.5)
 
-            x = min(max(x, 0), w - 1)
-            y = min(max(y, 0), h - 1)
+            x = 0 if x < 0 else w - 1 if x >= w else x
+            y = 0 if y < 0 else h - 1 if y >= h else y
 
             if x != currentX or y != currentY:
                 # TODO above hack is here too
-                if settings.value("SnapToBounds") == "1" and self.scene():
-                    x, y = self.scene().roomInfo.snapToBounds(x, y)
+                if scene and scene.snapToBounds:
+                    x, y = scene.roomInfo.snapToBounds(x, y)
 
                 self.updateCoords(x, y)
 
@@ -1363,11 +1571,14 @@ class Entity(QGraphicsItem):
             value.setY(yc)
 
             self.getStack()
-            if self.popup:
-                self.popup.update(self.stack)
 
             return value
 
+        # the popup sits above this entity, so it follows once the move has actually happened
+        if change == self.ItemPositionHasChanged:
+            if self.popup:
+                self.popup.update(self.stack)
+
         return QGraphicsItem.itemChange(self, change, value)
 
     def boundingRect(self):
@@ -1393,11 +1604,8 @@ class Entity(QGraphicsItem):
 
     def paint(self, painter, option, widget):
 
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
-        painter.setBrush(Qt.Dense5Pattern)
-        painter.setPen(QPen(Qt.white))
+        painter.setBrush(Entity.DEFAULT_BRUSH)
+        painter.setPen(Entity.DEFAULT_PEN)
 
         if self.entity.pixmap:
             xc, yc = 0, 0
@@ -1405,34 +1613,9 @@ class Entity(QGraphicsItem):
             typ, var, sub = self.entity.Type, self.entity.Variant, self.entity.Subtype
 
             def WallSnap():
-                ex = self.entity.x
-                ey = self.entity.y
-
-                shape = self.scene().roomInfo.shapeData
-
-                walls = shape["Walls"]
-                distancesY = [
-                    ((ex < w[0] or ex > w[1]) and 100000 or abs(ey - w[2]), w)
-                    for w in walls["X"]
-                ]
-                distancesX = [
-                    ((ey < w[0] or ey > w[1]) and 100000 or abs(ex - w[2]), w)
-                    for w in walls["Y"]
-                ]
-
-                closestY = min(distancesY, key=lambda w: w[0])
-                closestX = min(distancesX, key=lambda w: w[0])
-
-                # TODO match up with game when distances are equal
-                wx, wy = 0, 0
-                if closestY[0] < closestX[0]:
-                    w = closestY[1]
-                    wy = w[2] - ey
-                else:
-                    w = closestX[1]
-                    wx = (w[2] - ex) * 2
-
-                return wx, wy
+                return self.scene().roomInfo.wallSnapOffset(
+                    self.entity.x, self.entity.y
+                )
 
             customPlaceVisuals = {"WallSnap": WallSnap}
 
@@ -1448,21 +1631,12 @@ class Entity(QGraphicsItem):
             if override is not None:
                 img = override.get("Image")
                 if img:
-                    rendered = QPixmap(img)
+                    rendered = getCachedPixmap(img)
                     imgPath = img
 
                     placeVisual = override.get("PlaceVisual")
                     if placeVisual is not None:
-                        parts = list(map(lambda x: x.strip(), placeVisual.split(",")))
-                        if (
-                            len(parts) == 2
-                            and checkFloat(parts[0])
-                            and checkFloat(parts[1])
-                        ):
-                            placeVisual = (float(parts[0]), float(parts[1]))
-                        else:
-                            placeVisual = parts[0]
-                        recenter = placeVisual
+                        recenter = parsePlaceVisual(placeVisual)
 
                 if override.get("InvertDepth") == "1":
                     self.setZValue(-1 * self.entity.y)
@@ -1478,29 +1652,16 @@ class Entity(QGraphicsItem):
             xc += 1
             yc += 1
 
-            def drawGridBorders():
-                painter.drawLine(0, 0, 0, 4)
-                painter.drawLine(0, 0, 4, 0)
-
-                painter.drawLine(26, 0, 26, 4)
-                painter.drawLine(26, 0, 22, 0)
-
-                painter.drawLine(0, 26, 4, 26)
-                painter.drawLine(0, 26, 0, 22)
-
-                painter.drawLine(26, 26, 22, 26)
-                painter.drawLine(26, 26, 26, 22)
-
             if self.entity.config.renderPit:
                 Entity.PitAnm2.frame = self.getPitFrame(imgPath, rendered)
                 Entity.PitAnm2.spritesheets[0] = rendered
                 rendered = self.scene().getFrame(imgPath + " - pit", Entity.PitAnm2)
-                renderFunc = painter.drawImage
+                renderFunc = painter.drawPixmap
             elif self.entity.config.renderRock and self.entity.rockFrame is not None:
                 Entity.RockAnm2.frame = self.entity.rockFrame
                 Entity.RockAnm2.spritesheets[0] = rendered
                 rendered = self.scene().getFrame(imgPath + " - rock", Entity.RockAnm2)
-                renderFunc = painter.drawImage
+                renderFunc = painter.drawPixmap
 
                 # clear frame after rendering to reset for next frame
                 self.entity.rockFrame = None
@@ -1516,28 +1677,34 @@ class Entity(QGraphicsItem):
             if not self.entity.config.disableOffsetIndicator and (
                 abs(1 - yc) > 0.5 or abs(1 - xc) > 0.5
             ):
-                painter.setPen(self.OFFSET_SELECTION_PEN)
-                painter.setBrush(Qt.NoBrush)
-                painter.drawLine(13, 13, int(x + width / 2), y + height - 13)
-                drawGridBorders()
+                # where the entity actually is, a tile up from the bottom center of the sprite
+                markerX = x + width / 2
+                markerY = y + height - 13
+
+                painter.setPen(Entity.OFFSET_SELECTION_PEN)
+                painter.setBrush(Entity.NO_BRUSH)
+                # the marker line and the tile border share a pen, submit them together
+                painter.drawLines(
+                    [QLine(13, 13, int(markerX), markerY)] + Entity.GRID_BORDER_LINES
+                )
                 painter.fillRect(
-                    int(x + width / 2 - 3), y + height - 13 - 3, 6, 6, Qt.red
+                    int(markerX - 3), markerY - 3, 6, 6, Entity.OFFSET_MARKER_BRUSH
                 )
 
             if self.isSelected():
-                painter.setPen(self.SELECTION_PEN)
-                painter.setBrush(Qt.NoBrush)
+                painter.setPen(Entity.SELECTION_PEN)
+                painter.setBrush(Entity.NO_BRUSH)
                 painter.drawRect(x, y, width, height)
 
                 # Grid space boundary
-                painter.setPen(Qt.green)
-                drawGridBorders()
+                painter.setPen(Entity.GRID_BORDER_PEN)
+                painter.drawLines(Entity.GRID_BORDER_LINES)
 
             if self.entity.overlaypixmap:
                 painter.drawPixmap(0, 0, self.entity.overlaypixmap)
 
         if not self.entity.known:
-            painter.setFont(QFont("Arial", 6))
+            painter.setFont(Entity.UNKNOWN_FONT)
 
             painter.drawText(2, 26, "%d.%d.%d" % (typ, var, sub))
 
@@ -1547,7 +1714,7 @@ class Entity(QGraphicsItem):
             warningIcon = Entity.INVALID_ERROR_IMG
         # entities have 12 bits for type, variant, and subtype (?)
         # common mod error is to make them outside that range
-        elif self.entity.config.isOutOfRange():
+        elif self.entity.outOfRange:
             warningIcon = Entity.OUT_OF_RANGE_WARNING_IMG
 
         if warningIcon:
@@ -1556,9 +1723,10 @@ class Entity(QGraphicsItem):
     def remove(self):
         if self.popup:
             self.popup.remove()
-            self.scene().views()[0].canDelete = True
+            mainWindow.editor.canDelete = True
         self.updateBlockedDoor(True)
         self.setParentItem(None)
+        self.scene().removeFromEntCache(self)
         self.scene().removeItem(self)
 
     def mouseReleaseEvent(self, event):
@@ -1579,12 +1747,21 @@ class Entity(QGraphicsItem):
         self.hideWeightPopup()
 
     def getStack(self):
-        # Get the stack
-        stack = self.collidingItems(Qt.IntersectsItemBoundingRect)
+        # Get the stack straight from the scene's per-tile cache, topmost first
+        tile = mainWindow.scene.getEntitiesAt(self.entity.x, self.entity.y)
+
+        # almost every entity is alone on its tile, nothing to order then
+        if len(tile) <= 1:
+            stack = []
+        else:
+            stack = sorted(
+                (x for x in reversed(tile) if x is not self),
+                key=lambda x: x.zValue(),
+                reverse=True,
+            )
         stack.append(self)
 
-        # Make sure there are no doors or popups involved
-        self.stack = [x for x in stack if isinstance(x, Entity)]
+        self.stack = stack
 
         # 1 is not a stack.
         self.stackDepth = len(self.stack)
@@ -1604,7 +1781,7 @@ class Entity(QGraphicsItem):
             self.popup.setVisible(True)
             return
 
-        self.scene().views()[0].canDelete = False
+        mainWindow.editor.canDelete = False
         self.popup = EntityStack(self.stack)
         self.scene().addItem(self.popup)
 
@@ -1612,7 +1789,7 @@ class Entity(QGraphicsItem):
         if self.popup and self not in mainWindow.scene.selectedItems():
             self.popup.setVisible(False)
             if self.scene():
-                self.scene().views()[0].canDelete = True
+                mainWindow.editor.canDelete = True
 
 
 class EntityMenu(QWidget):
@@ -1744,6 +1921,9 @@ class EntityMenu(QWidget):
 
 class EntityStack(QGraphicsItem):
     MAX_STACK_DEPTH = 25
+    BACKGROUND_BRUSH = QBrush(QColor(0, 0, 0, 80))
+    BACKGROUND_PEN = QPen(Qt.transparent)
+    TEXT_PEN = QPen(Qt.white)
 
     class WeightSpinner(QDoubleSpinBox):
         def __init__(self):
@@ -1775,6 +1955,9 @@ class EntityStack(QGraphicsItem):
         QGraphicsItem.__init__(self)
         self.setZValue(1000)
 
+        if not hasattr(EntityStack, "TEXT_FONT"):
+            EntityStack.TEXT_FONT = QFont("Arial", 8)
+
         self.spinners = []
         self.activeSpinners = 0
         self.update(items)
@@ -1803,17 +1986,15 @@ class EntityStack(QGraphicsItem):
         self.items = items
         self.activeSpinners = activeSpinners
 
+        self.updateBounds()
+
     def weightChanged(self, idx):
         if idx < self.activeSpinners:
             self.items[idx].entity.weight = self.spinners[idx].widget().value()
 
     def paint(self, painter, option, widget):
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
-        brush = QBrush(QColor(0, 0, 0, 80))
-        painter.setPen(QPen(Qt.transparent))
-        painter.setBrush(brush)
+        painter.setPen(EntityStack.BACKGROUND_PEN)
+        painter.setBrush(EntityStack.BACKGROUND_BRUSH)
 
         r = self.boundingRect().adjusted(0, 0, 0, -16)
 
@@ -1824,8 +2005,8 @@ class EntityStack(QGraphicsItem):
         path.lineTo(r.center().x(), r.bottom() + 12)
         painter.drawPath(path)
 
-        painter.setPen(QPen(Qt.white))
-        painter.setFont(QFont("Arial", 8))
+        painter.setPen(EntityStack.TEXT_PEN)
+        painter.setFont(EntityStack.TEXT_FONT)
 
         w = 0
         for i, item in enumerate(self.items):
@@ -1837,7 +2018,7 @@ class EntityStack(QGraphicsItem):
             # painter.drawText(w, r.bottom()-16, pix.width(), 8, Qt.AlignCenter, "{:.1f}".format(item.entity.weight))
             w += pix.width()
 
-    def boundingRect(self):
+    def updateBounds(self):
         width = 0
         height = 0
 
@@ -1854,10 +2035,13 @@ class EntityStack(QGraphicsItem):
         height = height + 8 + 8 + 8 + 16  # Top, bottom, weight text, and arrow
         width = width + 4 + len(self.items) * 4  # Left and right and the middle bits
 
-        self.setX(self.items[-1].x() - width / 2 + 13)
-        self.setY(self.items[-1].y() - height)
+        self.prepareGeometryChange()
+        self.bounds = QRectF(0.0, 0.0, width, height)
 
-        return QRectF(0.0, 0.0, width, height)
+        self.setPos(self.items[-1].x() - width / 2 + 13, self.items[-1].y() - height)
+
+    def boundingRect(self):
+        return self.bounds
 
     def remove(self):
         # Fix for the null pointer left by the scene parent of the widget, avoids a segfault from the dangling pointer
@@ -1875,6 +2059,8 @@ class EntityStack(QGraphicsItem):
 class Door(QGraphicsItem):
     Image = None
     DisabledImage = None
+    # rotation -> (image, disabled image) pixmaps, shared by every door facing that way
+    RotatedImages = {}
 
     def __init__(self, doorItem):
         QGraphicsItem.__init__(self)
@@ -1887,25 +2073,33 @@ class Door(QGraphicsItem):
         self.setPos(self.doorItem[0] * 26 - 13, self.doorItem[1] * 26 - 13)
         self.setParentItem(mainWindow.scene.roomDoorRoot)
 
-        tr = QTransform()
+        rotation = 0
         if doorItem[0] in [0, 13]:
-            tr.rotate(270)
+            rotation = 270
             self.moveBy(-13, 0)
         elif doorItem[0] in [14, 27]:
-            tr.rotate(90)
+            rotation = 90
             self.moveBy(13, 0)
         elif doorItem[1] in [8, 15]:
-            tr.rotate(180)
+            rotation = 180
             self.moveBy(0, 13)
         else:
             self.moveBy(0, -13)
 
-        if not Door.Image:
-            Door.Image = QImage("resources/Backgrounds/Door.png")
-            Door.DisabledImage = QImage("resources/Backgrounds/DisabledDoor.png")
+        images = Door.RotatedImages.get(rotation)
+        if images is None:
+            if not Door.Image:
+                Door.Image = QImage("resources/Backgrounds/Door.png")
+                Door.DisabledImage = QImage("resources/Backgrounds/DisabledDoor.png")
+
+            tr = QTransform()
+            tr.rotate(rotation)
+            images = Door.RotatedImages[rotation] = (
+                QPixmap.fromImage(Door.Image.transformed(tr)),
+                QPixmap.fromImage(Door.DisabledImage.transformed(tr)),
+            )
 
-        self.image = Door.Image.transformed(tr)
-        self.disabledImage = Door.DisabledImage.transformed(tr)
+        self.image, self.disabledImage = images
 
     @property
     def exists(self):
@@ -1916,14 +2110,10 @@ class Door(QGraphicsItem):
         self.doorItem[2] = val
 
     def paint(self, painter, option, widget):
-
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
         if self.exists:
-            painter.drawImage(0, 0, self.image)
+            painter.drawPixmap(0, 0, self.image)
         else:
-            painter.drawImage(0, 0, self.disabledImage)
+            painter.drawPixmap(0, 0, self.disabledImage)
 
     def boundingRect(self):
         return QRectF(0.0, 0.0, 64.0, 52.0)
@@ -1952,259 +2142,7 @@ class Room(QListWidgetItem):
 
     # contains concrete room information necessary for examining a room's game qualities
     # such as type, variant, subtype, and shape information
-    class Info:
-        ########## SHAPE DEFINITIONS
-        # w x h
-        # 1 = 1x1, 2 = 1x0.5, 3 = 0.5x1, 4 = 1x2, 5 = 0.5x2, 6 = 2x1, 7 = 2x0.5, 8 = 2x2
-        # 9 = DR corner, 10 = DL corner, 11 = UR corner, 12 = UL corner
-        # all coords must be offset -1, -1 when saving
-        Shapes = {
-            1: {  # 1x1
-                "Doors": [[7, 0], [0, 4], [14, 4], [7, 8]],
-                # format: min, max on axis, cross axis coord, normal direction along cross axis
-                "Walls": {
-                    "X": [(0, 14, 0, 1), (0, 14, 8, -1)],
-                    "Y": [(0, 8, 0, 1), (0, 8, 14, -1)],
-                },
-                "Dims": (15, 9),
-            },
-            2: {  # horizontal closet (1x0.5)
-                "Doors": [[0, 4], [14, 4]],
-                "Walls": {
-                    "X": [(0, 14, 2, 1), (0, 14, 6, -1)],
-                    "Y": [(2, 6, 0, 1), (2, 6, 14, -1)],
-                },
-                "TopLeft": 30,  # Grid coord
-                "BaseShape": 1,  # Base Room shape this is rendered over
-                "Dims": (15, 5),
-            },
-            3: {  # vertical closet (0.5x1)
-                "Doors": [[7, 0], [7, 8]],
-                "Walls": {
-                    "X": [(4, 10, 0, 1), (4, 10, 8, -1)],
-                    "Y": [(0, 8, 4, 1), (0, 8, 10, -1)],
-                },
-                "TopLeft": 4,
-                "BaseShape": 1,
-                "Dims": (7, 9),
-            },
-            4: {  # 1x2 room
-                "Doors": [[7, 0], [14, 4], [0, 4], [14, 11], [0, 11], [7, 15]],
-                "Walls": {
-                    "X": [(0, 14, 0, 1), (0, 14, 15, -1)],
-                    "Y": [(0, 15, 0, 1), (0, 15, 14, -1)],
-                },
-                "Dims": (15, 16),
-            },
-            5: {  # tall closet (0.5x2)
-                "Doors": [[7, 0], [7, 15]],
-                "Walls": {
-                    "X": [(4, 10, 0, 1), (4, 10, 15, -1)],
-                    "Y": [(0, 15, 4, 1), (0, 15, 10, -1)],
-                },
-                "TopLeft": 4,
-                "BaseShape": 4,
-                "Dims": (7, 16),
-            },
-            6: {  # 2x1 room
-                "Doors": [[7, 0], [0, 4], [7, 8], [20, 8], [27, 4], [20, 0]],
-                "Walls": {
-                    "X": [(0, 27, 0, 1), (0, 27, 8, -1)],
-                    "Y": [(0, 8, 0, 1), (0, 8, 27, -1)],
-                },
-                "Dims": (28, 9),
-            },
-            7: {  # wide closet (2x0.5)
-                "Doors": [[0, 4], [27, 4]],
-                "Walls": {
-                    "X": [(0, 27, 2, 1), (0, 27, 6, -1)],
-                    "Y": [(2, 6, 0, 1), (2, 6, 27, -1)],
-                },
-                "TopLeft": 56,
-                "BaseShape": 6,
-                "Dims": (28, 5),
-            },
-            8: {  # 2x2 room
-                "Doors": [
-                    [7, 0],
-                    [0, 4],
-                    [0, 11],
-                    [20, 0],
-                    [7, 15],
-                    [20, 15],
-                    [27, 4],
-                    [27, 11],
-                ],
-                "Walls": {
-                    "X": [(0, 27, 0, 1), (0, 27, 15, -1)],
-                    "Y": [(0, 15, 0, 1), (0, 15, 27, -1)],
-                },
-                "Dims": (28, 16),
-            },
-            9: {  # mirrored L room
-                "Doors": [
-                    [20, 0],
-                    [27, 4],
-                    [7, 15],
-                    [20, 15],
-                    [13, 4],
-                    [0, 11],
-                    [27, 11],
-                    [7, 7],
-                ],
-                "Walls": {
-                    "X": [(0, 13, 7, 1), (13, 27, 0, 1), (0, 27, 15, -1)],
-                    "Y": [(7, 15, 0, 1), (0, 7, 13, 1), (0, 15, 27, -1)],
-                },
-                "BaseShape": 8,
-                "MirrorX": 10,
-                "MirrorY": 11,
-                "Dims": (28, 16),
-            },
-            10: {  # L room
-                "Doors": [
-                    [0, 4],
-                    [14, 4],
-                    [7, 0],
-                    [20, 7],
-                    [7, 15],
-                    [20, 15],
-                    [0, 11],
-                    [27, 11],
-                ],
-                "Walls": {
-                    "X": [(0, 14, 0, 1), (14, 27, 7, 1), (0, 27, 15, -1)],
-                    "Y": [(0, 15, 0, 1), (0, 7, 14, -1), (7, 15, 27, -1)],
-                },
-                "BaseShape": 8,
-                "MirrorX": 9,
-                "MirrorY": 12,
-                "Dims": (28, 16),
-            },
-            11: {  # mirrored r room
-                "Doors": [
-                    [0, 4],
-                    [7, 8],
-                    [7, 0],
-                    [13, 11],
-                    [20, 0],
-                    [27, 4],
-                    [20, 15],
-                    [27, 11],
-                ],
-                "Walls": {
-                    "X": [(0, 27, 0, 1), (0, 13, 8, -1), (13, 27, 15, -1)],
-                    "Y": [(0, 8, 0, 1), (8, 15, 13, 1), (0, 15, 27, -1)],
-                },
-                "BaseShape": 8,
-                "MirrorX": 12,
-                "MirrorY": 9,
-                "Dims": (28, 16),
-            },
-            12: {  # r room
-                "Doors": [
-                    [0, 4],
-                    [7, 0],
-                    [20, 0],
-                    [14, 11],
-                    [27, 4],
-                    [7, 15],
-                    [0, 11],
-                    [20, 8],
-                ],
-                "Walls": {
-                    "X": [(0, 27, 0, 1), (14, 27, 8, -1), (0, 14, 15, -1)],
-                    "Y": [(0, 15, 0, 1), (8, 15, 14, -1), (0, 8, 27, -1)],
-                },
-                "BaseShape": 8,
-                "MirrorX": 11,
-                "MirrorY": 10,
-                "Dims": (28, 16),
-            },
-        }
-
-        for shape in Shapes.values():
-            doorWalls = shape["DoorWalls"] = []
-            for door in shape["Doors"]:
-                door.append(True)
-                for wall in shape["Walls"]["X"]:
-                    if door[0] >= wall[0] and door[0] <= wall[1] and door[1] == wall[2]:
-                        doorWalls.append((door, wall, "X"))
-                        break
-                for wall in shape["Walls"]["Y"]:
-                    if door[1] >= wall[0] and door[1] <= wall[1] and door[0] == wall[2]:
-                        doorWalls.append((door, wall, "Y"))
-
-        def __init__(self, t=0, v=0, s=0, shape=1):
-            self.type = t
-            self.variant = v
-            self.subtype = s
-            self.shape = shape
-
-        @property
-        def shape(self):
-            return self._shape
-
-        @shape.setter
-        def shape(self, val):
-            self._shape = val
-            self.shapeData = Room.Info.Shapes[self.shape]
-            bs = self.shapeData.get("BaseShape")
-            self.baseShapeData = bs and Room.Info.Shapes[bs]
-            self.makeNewDoors()
-
-        # represents the actual dimensions of the room, including out of bounds
-        @property
-        def dims(self):
-            return (self.baseShapeData or self.shapeData)["Dims"]
-
-        @property
-        def width(self):
-            return self.shapeData["Dims"][0]
-
-        @property
-        def height(self):
-            return self.shapeData["Dims"][1]
-
-        def makeNewDoors(self):
-            self.doors = [door[:] for door in self.shapeData["Doors"]]
-
-        def gridLen(self):
-            dims = self.dims
-            return dims[0] * dims[1]
-
-        def gridIndex(x, y, w):
-            return y * w + x
-
-        def inFrontOfDoor(self, x, y):
-            for door, wall, axis in self.shapeData["DoorWalls"]:
-                if axis == "X" and door[0] == x and y - door[1] == wall[3]:
-                    return door
-                if axis == "Y" and door[1] == y and x - door[0] == wall[3]:
-                    return door
-            return None
-
-        def _axisBounds(a, c, w):
-            wMin, wMax, wLvl, wDir = w
-            return a < wMin or a > wMax or ((c > wLvl) - (c < wLvl)) == wDir
-
-        def isInBounds(self, x, y):
-            return all(
-                Room.Info._axisBounds(x, y, w) for w in self.shapeData["Walls"]["X"]
-            ) and all(
-                Room.Info._axisBounds(y, x, w) for w in self.shapeData["Walls"]["Y"]
-            )
-
-        def snapToBounds(self, x, y, dist=1):
-            for w in self.shapeData["Walls"]["X"]:
-                if not Room.Info._axisBounds(x, y, w):
-                    y = w[2] + w[3] * dist
-
-            for w in self.shapeData["Walls"]["Y"]:
-                if not Room.Info._axisBounds(y, x, w):
-                    x = w[2] + w[3] * dist
-
-            return (x, y)
+    Info = RoomData.Info
 
     def __init__(
         self,
@@ -2269,18 +2207,7 @@ class Room(QListWidgetItem):
         self.setData(0x100, n)
         self.seed = hash(n)
 
-    @property
-    def gridSpawns(self):
-        return self._gridSpawns
-
-    @gridSpawns.setter
-    def gridSpawns(self, g):
-        self._gridSpawns = g
-
-        self._spawnCount = 0
-        for entStack in self.gridSpawns:
-            if entStack:
-                self._spawnCount += 1
+    gridSpawns = RoomData.gridSpawns
 
     @property
     def lastTestTime(self):
@@ -2298,8 +2225,7 @@ class Room(QListWidgetItem):
         for door in self.info.doors:
             d = Door(door)
 
-    def getSpawnCount(self):
-        return self._spawnCount
+    getSpawnCount = RoomData.getSpawnCount
 
     def reshape(self, shape, doors=None):
         spawnIter = self.spawns()
@@ -2349,34 +2275,9 @@ class Room(QListWidgetItem):
             )
             return
 
-        i = QIcon(roomTypes[0].get("Icon"))
-        self.setIcon(i)
-
-    class _SpawnIter:
-        def __init__(self, gridSpawns, dims):
-            self.idx = -1
-            self.spawns = gridSpawns
-            self.width, self.height = dims
-
-        def __iter__(self):
-            return self
-
-        def __next__(self):
-            stack = None
-            while True:
-                self.idx += 1
-                if self.idx >= self.width * self.height or self.idx >= len(self.spawns):
-                    raise StopIteration
-
-                stack = self.spawns[self.idx]
-                if stack:
-                    break
-            x = int(self.idx % self.width)
-            y = int(self.idx / self.width)
-            return (stack, x, y)
+        self.setIcon(getCachedIcon(roomTypes[0].get("Icon")))
 
-    def spawns(self):
-        return Room._SpawnIter(self.gridSpawns, self.info.dims)
+    spawns = RoomData.spawns
 
     def setRoomBG(self, val=None):
         global xmlLookups
@@ -2391,34 +2292,39 @@ class Room(QListWidgetItem):
         )
 
     def mirrorX(self):
-        # Flip spawns
+        # Flip spawns, a row at a time
         width, height = self.info.dims
-        for y in range(height):
-            for x in range(int(width / 2)):
-                ox = Room.Info.gridIndex(x, y, width)
-                mx = Room.Info.gridIndex(width - x - 1, y, width)
-                oxs = self.gridSpawns[ox]
-                self.gridSpawns[ox] = self.gridSpawns[mx]
-                self.gridSpawns[mx] = oxs
+        spawns = self.gridSpawns
+        for rowStart in range(0, width * height, width):
+            row = slice(rowStart, rowStart + width)
+            spawns[row] = spawns[row][::-1]
 
         # Flip doors
         for door in self.info.doors:
             door[0] = width - door[0] - 1
 
-        # Flip entities
+        # Flip entities, looking up each distinct entity's config once
+        configs = {}
         info = Entity.Info(changeAtStart=False)
         for stack, x, y in self.spawns():
             for spawn in stack:
-                info.changeTo(spawn[0], spawn[1], spawn[2])
+                key = (spawn[0], spawn[1], spawn[2])
+                config = configs.get(key)
+                if config is None:
+                    config = configs[key] = (
+                        xmlLookups.entities.lookupOne(*key)
+                        or xmlLookups.entities.DEFAULT_ENTITY_CONFIG
+                    )
 
                 # Directional entities
-                if info.config.mirrorX:
+                if config.mirrorX:
                     for i in range(3):
-                        spawn[i] = info.config.mirrorX[i]
+                        spawn[i] = config.mirrorX[i]
 
                 # Entities with subtypes that represent degrees
-                if info.config.hasBitfields:
-                    for bitfield in info.config.bitfields:
+                if config.hasBitfields:
+                    info.changeTo(*key)
+                    for bitfield in config.bitfields:
                         for element in bitfield.elements:
                             if element.unit == "Degrees":
                                 angle = element.getWidgetValue(
@@ -2450,34 +2356,41 @@ class Room(QListWidgetItem):
             self.reshape(shape, self.info.doors)
 
     def mirrorY(self):
-        # Flip spawns
+        # Flip spawns, swapping whole rows
         width, height = self.info.dims
-        for x in range(width):
-            for y in range(int(height / 2)):
-                oy = Room.Info.gridIndex(x, y, width)
-                my = Room.Info.gridIndex(x, height - y - 1, width)
-                oys = self.gridSpawns[oy]
-                self.gridSpawns[oy] = self.gridSpawns[my]
-                self.gridSpawns[my] = oys
+        spawns = self.gridSpawns
+        spawns[: width * height] = [
+            spawn
+            for rowStart in range(width * (height - 1), -1, -width)
+            for spawn in spawns[rowStart : rowStart + width]
+        ]
 
         # Flip doors
         for door in self.info.doors:
             door[1] = height - door[1] - 1
 
-        # Flip entities
+        # Flip entities, looking up each distinct entity's config once
+        configs = {}
         info = Entity.Info(changeAtStart=False)
         for stack, x, y in self.spawns():
             for spawn in stack:
-                info.changeTo(spawn[0], spawn[1], spawn[2])
+                key = (spawn[0], spawn[1], spawn[2])
+                config = configs.get(key)
+                if config is None:
+                    config = configs[key] = (
+                        xmlLookups.entities.lookupOne(*key)
+                        or xmlLookups.entities.DEFAULT_ENTITY_CONFIG
+                    )
 
                 # Directional entities
-                if info.config.mirrorY:
+                if config.mirrorY:
                     for i in range(3):
-                        spawn[i] = info.config.mirrorY[i]
+                        spawn[i] = config.mirrorY[i]
 
                 # Entities with subtypes that represent degrees
-                if info.config.hasBitfields:
-                    for bitfield in info.config.bitfields:
+                if config.hasBitfields:
+                    info.changeTo(*key)
+                    for bitfield in config.bitfields:
                         for element in bitfield.elements:
                             if element.unit == "Degrees":
                                 angle = element.getWidgetValue(
@@ -2517,14 +2430,16 @@ class RoomDelegate(QStyledItemDelegate):
 
     def paint(self, painter, option, index):
 
-        painter.fillRect(
-            option.rect.right() - 19, option.rect.top(), 17, 16, QBrush(Qt.white)
-        )
+        # the current room flag lives in the model, no need to go through the list widget
+        isCurrent = index.data(100)
+        if isCurrent:
+            painter.fillRect(
+                option.rect.right() - 19, option.rect.top(), 17, 16, QBrush(Qt.white)
+            )
 
         QStyledItemDelegate.paint(self, painter, option, index)
 
-        item = mainWindow.roomList.list.item(index.row())
-        if item is not None and item.data(100):
+        if isCurrent:
             painter.drawPixmap(option.rect.right() - 19, option.rect.top(), self.pixmap)
 
 
@@ -2539,18 +2454,20 @@ class FilterMenu(QMenu):
 
         painter = QPainter(self)
 
+        # hovering only repaints the items it touches, leave the rest alone
+        dirty = event.rect()
+
         for act in self.actions():
             rect = self.actionGeometry(act)
-            painter.fillRect(
-                int(rect.right() / 2 - 12),
-                rect.top() - 2,
-                24,
-                24,
-                QBrush(Qt.transparent),
-            )
-            painter.drawPixmap(
-                int(rect.right() / 2 - 12), rect.top() - 2, act.icon().pixmap(24, 24)
-            )
+            iconRect = QRect(int(rect.right() / 2 - 12), rect.top() - 2, 24, 24)
+            if not iconRect.intersects(dirty):
+                continue
+
+            painter.drawPixmap(iconRect.topLeft(), act.icon().pixmap(24, 24))
+
+
+# the " (2)" counter in duplicated room names
+DUPLICATE_COUNTER_REGEX = re.compile(r" \((\d*)\)")
 
 
 class RoomSelector(QWidget):
@@ -2581,8 +2498,7 @@ class RoomSelector(QWidget):
         self.filter = QGridLayout()
         self.filter.setSpacing(4)
 
-        fq = QImage()
-        fq.load("resources/UI/FilterIcons.png")
+        fq = "resources/UI/FilterIcons.png"
 
         # Set the custom data
         self.filter.typeData = -1
@@ -2604,7 +2520,12 @@ class RoomSelector(QWidget):
         # ID Filter
         self.IDFilter = QLineEdit()
         self.IDFilter.setPlaceholderText("ID / Name")
-        self.IDFilter.textChanged.connect(self.changeFilter)
+        # wait for a pause in typing before filtering, rather than every keystroke
+        self.filterTimer = QTimer()
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.setInterval(150)
+        self.filterTimer.timeout.connect(self.changeFilter)
+        self.IDFilter.textChanged.connect(self.filterTimer.start)
 
         # Entity Toggle Button
         self.entityToggle = QToolButton()
@@ -2613,7 +2534,7 @@ class RoomSelector(QWidget):
         self.entityToggle.setIconSize(QSize(24, 24))
         self.entityToggle.toggled.connect(self.setEntityToggle)
         self.entityToggle.toggled.connect(self.changeFilter)
-        self.entityToggle.setIcon(QIcon(QPixmap.fromImage(fq.copy(0, 0, 24, 24))))
+        self.entityToggle.setIcon(getCachedSheetIcon(fq, 0, 0, 24, 24))
 
         # Type Toggle Button
         self.typeToggle = QToolButton()
@@ -2622,17 +2543,13 @@ class RoomSelector(QWidget):
 
         typeMenu = QMenu()
 
-        self.typeToggle.setIcon(
-            QIcon(QPixmap.fromImage(fq.copy(1 * 24 + 4, 4, 16, 16)))
-        )
-        act = typeMenu.addAction(
-            QIcon(QPixmap.fromImage(fq.copy(1 * 24 + 4, 4, 16, 16))), ""
-        )
+        self.typeToggle.setIcon(getCachedSheetIcon(fq, 1 * 24 + 4, 4, 16, 16))
+        act = typeMenu.addAction(getCachedSheetIcon(fq, 1 * 24 + 4, 4, 16, 16), "")
         act.setData(-1)
         self.typeToggle.setDefaultAction(act)
 
         for iconType in xmlLookups.roomTypes.lookup(showInMenu=True):
-            act = typeMenu.addAction(QIcon(iconType.get("Icon")), "")
+            act = typeMenu.addAction(getCachedIcon(iconType.get("Icon")), "")
             act.setData(int(iconType.get("Type")))
 
         self.typeToggle.triggered.connect(self.setTypeFilter)
@@ -2656,7 +2573,7 @@ class RoomSelector(QWidget):
         self.extraToggle.setIconSize(QSize(24, 24))
         self.extraToggle.setPopupMode(QToolButton.InstantPopup)
 
-        self.extraToggle.setIcon(QIcon(QPixmap.fromImage(fq.copy(4 * 24, 0, 24, 24))))
+        self.extraToggle.setIcon(getCachedSheetIcon(fq, 4 * 24, 0, 24, 24))
         self.extraToggle.setToolTip("Right click for additional filter options")
         self.extraToggle.clicked.connect(self.setExtraFilter)
         self.extraToggle.rightClicked.connect(lambda: FilterDialog(self).exec())
@@ -2668,21 +2585,16 @@ class RoomSelector(QWidget):
 
         sizeMenu = FilterMenu()
 
-        q = QImage()
-        q.load("resources/UI/ShapeIcons.png")
+        q = "resources/UI/ShapeIcons.png"
 
-        self.sizeToggle.setIcon(QIcon(QPixmap.fromImage(fq.copy(3 * 24, 0, 24, 24))))
-        act = sizeMenu.addAction(
-            QIcon(QPixmap.fromImage(fq.copy(3 * 24, 0, 24, 24))), ""
-        )
+        self.sizeToggle.setIcon(getCachedSheetIcon(fq, 3 * 24, 0, 24, 24))
+        act = sizeMenu.addAction(getCachedSheetIcon(fq, 3 * 24, 0, 24, 24), "")
         act.setData(-1)
         act.setIconVisibleInMenu(False)
         self.sizeToggle.setDefaultAction(act)
 
         for i in range(12):
-            act = sizeMenu.addAction(
-                QIcon(QPixmap.fromImage(q.copy(i * 16, 0, 16, 16))), ""
-            )
+            act = sizeMenu.addAction(getCachedSheetIcon(q, i * 16, 0, 16, 16), "")
             act.setData(i + 1)
             act.setIconVisibleInMenu(False)
 
@@ -2763,12 +2675,13 @@ class RoomSelector(QWidget):
         self.list.doubleClicked.connect(self.activateEdit)
         self.list.customContextMenuRequested.connect(self.customContextMenu)
 
+        # rooms left visible by the filter, counted again only when rows come or go
+        self.visibleRoomCount = None
+
         model = self.list.model()
-        model.rowsInserted.connect(self.handleRoomListDisplayChanged)
-        model.rowsRemoved.connect(self.handleRoomListDisplayChanged)
-        model.modelReset.connect(
-            self.handleRoomListDisplayChanged
-        )  # fired when cleared
+        model.rowsInserted.connect(self.handleRoomListRowsChanged)
+        model.rowsRemoved.connect(self.handleRoomListRowsChanged)
+        model.modelReset.connect(self.handleRoomListRowsChanged)  # fired when cleared
 
         self.list.itemDelegate().closeEditor.connect(self.editComplete)
 
@@ -2800,15 +2713,20 @@ class RoomSelector(QWidget):
         # self.IDButton.setCheckable(True)
         # self.IDButton.setChecked(True)
 
+    def handleRoomListRowsChanged(self):
+        self.visibleRoomCount = None
+        self.handleRoomListDisplayChanged()
+
     def handleRoomListDisplayChanged(self):
         selectedRooms = len(self.selectedRooms())
 
         numRooms = selectedRooms
         if numRooms < 2:
-            numRooms = 0
-            for room in self.getRooms():
-                if not room.isHidden():
-                    numRooms += 1
+            if self.visibleRoomCount is None:
+                self.visibleRoomCount = sum(
+                    not room.isHidden() for room in self.getRooms()
+                )
+            numRooms = self.visibleRoomCount
 
         self.numRoomsLabel.setText(
             f"{'Selected rooms' if selectedRooms > 1 else 'Num Rooms'}: {numRooms}"
@@ -2832,26 +2750,16 @@ class RoomSelector(QWidget):
         return
 
     # @pyqtSlot(QPoint)
-    def customContextMenu(self, pos):
-        if not self.selectedRoom():
-            return
-
-        menu = QMenu(self.list)
+    def buildContextMenu(self):
+        menu = self.contextMenu = QMenu(self.list)
 
         # Type
         Type = QWidgetAction(menu)
-        c = QComboBox()
+        c = self.contextType = QComboBox()
 
-        global xmlLookups
-        types = xmlLookups.roomTypes.lookup(showInMenu=True)
-        matchingTypes = xmlLookups.roomTypes.lookup(
-            room=self.selectedRoom(), showInMenu=True
-        )
-
-        for i, t in enumerate(types):
-            c.addItem(QIcon(t.get("Icon")), t.get("Name"))
-            if t in matchingTypes:
-                c.setCurrentIndex(i)
+        self.contextTypes = xmlLookups.roomTypes.lookup(showInMenu=True)
+        for t in self.contextTypes:
+            c.addItem(getCachedIcon(t.get("Icon")), t.get("Name"))
 
         c.currentIndexChanged.connect(self.changeType)
         Type.setDefaultWidget(c)
@@ -2859,12 +2767,10 @@ class RoomSelector(QWidget):
 
         # Variant
         Variant = QWidgetAction(menu)
-        s = QSpinBox()
+        s = self.contextVariant = QSpinBox()
         s.setRange(0, 65534)
         s.setPrefix("ID - ")
 
-        s.setValue(self.selectedRoom().info.variant)
-
         Variant.setDefaultWidget(s)
         s.valueChanged.connect(self.changeVariant)
         menu.addAction(Variant)
@@ -2873,35 +2779,29 @@ class RoomSelector(QWidget):
 
         # Difficulty
         Difficulty = QWidgetAction(menu)
-        dv = QSpinBox()
+        dv = self.contextDifficulty = QSpinBox()
         dv.setRange(0, 20)
         dv.setPrefix("Difficulty - ")
 
-        dv.setValue(self.selectedRoom().difficulty)
-
         Difficulty.setDefaultWidget(dv)
         dv.valueChanged.connect(self.changeDifficulty)
         menu.addAction(Difficulty)
 
         # Weight
         weight = QWidgetAction(menu)
-        s = QDoubleSpinBox()
+        s = self.contextWeight = QDoubleSpinBox()
         s.setPrefix("Weight - ")
 
-        s.setValue(self.selectedRoom().weight)
-
         weight.setDefaultWidget(s)
         s.valueChanged.connect(self.changeWeight)
         menu.addAction(weight)
 
         # Subtype
         Subtype = QWidgetAction(menu)
-        st = QSpinBox()
+        st = self.contextSubtype = QSpinBox()
         st.setRange(0, 4096)
         st.setPrefix("Sub - ")
 
-        st.setValue(self.selectedRoom().info.subtype)
-
         Subtype.setDefaultWidget(st)
         st.valueChanged.connect(self.changeSubtype)
         menu.addAction(Subtype)
@@ -2910,23 +2810,59 @@ class RoomSelector(QWidget):
 
         # Room shape
         Shape = QWidgetAction(menu)
-        c = QComboBox()
+        c = self.contextShape = QComboBox()
 
-        q = QImage()
-        q.load("resources/UI/ShapeIcons.png")
+        q = "resources/UI/ShapeIcons.png"
 
         for shapeName in range(1, 13):
             c.addItem(
-                QIcon(QPixmap.fromImage(q.copy((shapeName - 1) * 16, 0, 16, 16))),
+                getCachedSheetIcon(q, (shapeName - 1) * 16, 0, 16, 16),
                 str(shapeName),
             )
-        c.setCurrentIndex(self.selectedRoom().info.shape - 1)
         c.currentIndexChanged.connect(self.changeSize)
         Shape.setDefaultWidget(c)
         menu.addAction(Shape)
 
+    def customContextMenu(self, pos):
+        room = self.selectedRoom()
+        if not room:
+            return
+
+        # the menu is only built once, after that it just needs the selected room's values
+        if not hasattr(self, "contextMenu"):
+            self.buildContextMenu()
+
+        matchingTypes = xmlLookups.roomTypes.lookup(room=room, showInMenu=True)
+        typeIndex = 0
+        for i, t in enumerate(self.contextTypes):
+            if t in matchingTypes:
+                typeIndex = i
+
+        widgets = (
+            self.contextType,
+            self.contextVariant,
+            self.contextDifficulty,
+            self.contextWeight,
+            self.contextSubtype,
+            self.contextShape,
+        )
+
+        # filling in the values shouldn't apply them to the selection
+        for widget in widgets:
+            widget.blockSignals(True)
+
+        self.contextType.setCurrentIndex(typeIndex)
+        self.contextVariant.setValue(room.info.variant)
+        self.contextDifficulty.setValue(room.difficulty)
+        self.contextWeight.setValue(room.weight)
+        self.contextSubtype.setValue(room.info.subtype)
+        self.contextShape.setCurrentIndex(room.info.shape - 1)
+
+        for widget in widgets:
+            widget.blockSignals(False)
+
         # End it
-        menu.exec(self.list.mapToGlobal(pos))
+        self.contextMenu.exec(self.list.mapToGlobal(pos))
 
     # @pyqtSlot(bool)
     def clearAllFilter(self):
@@ -2990,171 +2926,177 @@ class RoomSelector(QWidget):
     def colorizeClearFilterButtons(self):
         colour = "background-color: #F00;"
 
-        all = False
+        active = [
+            # Name Button
+            (self.clearName, bool(self.IDFilter.text())),
+            # Entity Button
+            (self.clearEntity, bool(self.entityToggle.checked)),
+            # Type Button
+            (self.clearType, self.filter.typeData >= 0),
+            # Size Button
+            (self.clearSize, self.filter.sizeData >= 0),
+            # Extra filters Button
+            (self.clearExtra, bool(self.filter.extraData["enabled"])),
+        ]
+        # All Button
+        active.append((self.clearAll, any(on for button, on in active)))
 
-        # Name Button
-        if self.IDFilter.text():
-            self.clearName.setStyleSheet(colour)
-            all = True
-        else:
-            self.clearName.setStyleSheet("")
+        # restyling is expensive even when nothing changed, so only touch buttons that flipped
+        for button, on in active:
+            style = colour if on else ""
+            if button.styleSheet() != style:
+                button.setStyleSheet(style)
 
-        # Entity Button
-        if self.entityToggle.checked:
-            self.clearEntity.setStyleSheet(colour)
-            all = True
-        else:
-            self.clearEntity.setStyleSheet("")
+    # @pyqtSlot()
+    def changeFilter(self):
+        # this pass covers any filter still waiting on typing
+        self.filterTimer.stop()
 
-        # Type Button
-        if self.filter.typeData >= 0:
-            self.clearType.setStyleSheet(colour)
-            all = True
-        else:
-            self.clearType.setStyleSheet("")
+        self.colorizeClearFilterButtons()
 
-        # Size Button
-        if self.filter.sizeData >= 0:
-            self.clearSize.setStyleSheet(colour)
-            all = True
-        else:
-            self.clearSize.setStyleSheet("")
+        # everything the rooms are compared against is the same for each of them
+        idFilter = self.IDFilter.text().lower()
 
-        # Extra filters Button
-        if self.filter.extraData["enabled"]:
-            self.clearExtra.setStyleSheet(colour)
-            all = True
-        else:
-            self.clearExtra.setStyleSheet("")
+        entityOn = bool(self.entityToggle.checked and self.filterEntity)
+        filterId = entityOn and self.filterEntity.config.uniqueid
 
-        # All Button
-        if all:
-            self.clearAll.setStyleSheet(colour)
-        else:
-            self.clearAll.setStyleSheet("")
+        typeData = self.filter.typeData
+        sizeData = self.filter.sizeData
 
-    # @pyqtSlot()
-    def changeFilter(self):
-        self.colorizeClearFilterButtons()
+        # For null rooms, include "empty" rooms regardless of type
+        emptyTags = ["InEmptyRooms"]
+        if typeData == 0 and settings.value("NonCombatRoomFilter") == "1":
+            emptyTags.append("InNonCombatRooms")
 
-        # Here we go
-        for room in self.getRooms():
-            IDCond = entityCond = typeCond = sizeCond = extraCond = True
+        # rooms share most of their entities, so each config's tags are only checked once
+        emptyConfigs = {}
 
-            IDCond = self.IDFilter.text().lower() in room.text().lower()
+        def allowedInEmpty(config):
+            allowed = emptyConfigs.get(config)
+            if allowed is None:
+                allowed = emptyConfigs[config] = config.matches(
+                    tags=emptyTags, matchAnyTag=True
+                )
+            return allowed
 
-            # Check if the right entity is in the room
-            if self.entityToggle.checked and self.filterEntity:
-                entityCond = self.filterEntity.config.uniqueid in room.palette
+        extraData = self.filter.extraData
+        extraOn = extraData["enabled"]
 
-            # Check if the room is the right type
-            if self.filter.typeData != -1:
-                # All the normal rooms
-                typeCond = self.filter.typeData == room.info.type
+        weightData = extraData["weight"]
+        weightOn = extraOn and weightData["enabled"]
 
-                # For null rooms, include "empty" rooms regardless of type
-                if not typeCond and self.filter.typeData == 0:
-                    nonCombatRooms = settings.value("NonCombatRoomFilter") == "1"
-                    checkTags = ["InEmptyRooms"]
-                    if nonCombatRooms:
-                        checkTags.append("InNonCombatRooms")
+        difficultyData = extraData["difficulty"]
+        difficultyOn = extraOn and difficultyData["enabled"]
 
-                    hasUsefulEntities = any(
-                        not config.matches(tags=checkTags, matchAnyTag=True)
-                        for config in room.palette.values()
-                    )
+        subtypeData = extraData["subtype"]
+        subtypeOn = extraOn and subtypeData["enabled"]
+
+        lastTestTimeData = extraData["lastTestTime"]
+        lastTestTimeOn = extraOn and lastTestTimeData["enabled"]
+
+        tagsData = extraData["tags"]
+        tagsOn = extraOn and tagsData["enabled"]
+        tagsMode = tagsData["mode"]
+        checkTags = tagsData["tags"]
+        matchAnyTag = tagsMode == "Any" or tagsMode == "Blacklist"
+        checkUnmatched = tagsMode == "Exclusive"
+        invertTags = tagsMode == "Blacklist" or tagsMode == "Exclusive"
+
+        # with no filter set every room matches, so none of them need checking
+        filtering = bool(
+            idFilter or entityOn or typeData != -1 or sizeData != -1 or extraOn
+        )
+
+        # every room's visibility is decided here, so count them along the way
+        self.visibleRoomCount = None
+        visibleRooms = 0
+
+        # repaint the list once at the end rather than for every room
+        self.list.setUpdatesEnabled(False)
+        try:
+            # Here we go; each check only runs while the room still matches
+            for room in self.getRooms():
+                isMatch = not filtering or idFilter in room.text().lower()
+                info = room.info
 
-                    typeCond = not hasUsefulEntities
+                # Check if the room is the right size
+                if isMatch and sizeData != -1:
+                    isMatch = sizeData == info.shape
+
+                # Check if the right entity is in the room
+                if isMatch and entityOn:
+                    isMatch = filterId in room.palette
+
+                # Check if the room is the right type
+                if isMatch and typeData != -1:
+                    isMatch = typeData == info.type
+
+                    if not isMatch and typeData == 0:
+                        isMatch = all(map(allowedInEmpty, room.palette.values()))
 
-            if self.filter.extraData["enabled"]:
                 # Check if the room is the right weight
-                weightData = self.filter.extraData["weight"]
-                if extraCond and weightData["enabled"]:
+                if isMatch and weightOn:
                     if weightData["useRange"]:
-                        extraCond = (
-                            extraCond
-                            and weightData["min"] <= room.weight <= weightData["max"]
-                        )
+                        isMatch = weightData["min"] <= room.weight <= weightData["max"]
                     else:
                         eps = 0.0001
-                        extraCond = (
-                            extraCond and abs(weightData["min"] - room.weight) < eps
-                        )
+                        isMatch = abs(weightData["min"] - room.weight) < eps
 
                 # Check if the room is the right difficulty
-                difficultyData = self.filter.extraData["difficulty"]
-                if extraCond and difficultyData["enabled"]:
+                if isMatch and difficultyOn:
                     if difficultyData["useRange"]:
-                        extraCond = (
-                            extraCond
-                            and difficultyData["min"]
+                        isMatch = (
+                            difficultyData["min"]
                             <= room.difficulty
                             <= difficultyData["max"]
                         )
                     else:
-                        extraCond = difficultyData["min"] == room.difficulty
+                        isMatch = difficultyData["min"] == room.difficulty
 
                 # Check if the room is the right subtype
-                subtypeData = self.filter.extraData["subtype"]
-                if extraCond and subtypeData["enabled"]:
+                if isMatch and subtypeOn:
                     if subtypeData["useRange"]:
-                        extraCond = (
-                            extraCond
-                            and subtypeData["min"]
-                            <= room.info.subtype
-                            <= subtypeData["max"]
+                        isMatch = (
+                            subtypeData["min"] <= info.subtype <= subtypeData["max"]
                         )
                     else:
-                        extraCond = subtypeData["min"] == room.info.subtype
+                        isMatch = subtypeData["min"] == info.subtype
 
                 # Check if the room has been tested between a specific time range,
                 # or tested before a certain date
-                lastTestTimeData = self.filter.extraData["lastTestTime"]
-                if extraCond and lastTestTimeData["enabled"]:
+                if isMatch and lastTestTimeOn:
                     if lastTestTimeData["useRange"]:
                         # intentionally reversed; min is always the main value, but the default comparison for last time is for earlier times
-                        extraCond = (
-                            extraCond
-                            and room.lastTestTime
+                        isMatch = (
+                            room.lastTestTime
                             and lastTestTimeData["max"]
                             <= room.lastTestTime
                             <= lastTestTimeData["min"]
                         )
                     else:
-                        extraCond = extraCond and (
+                        isMatch = (
                             not room.lastTestTime
                             or room.lastTestTime <= lastTestTimeData["min"]
                         )
 
                 # Check if the room contains entities with certain tags
-                tagsData = self.filter.extraData["tags"]
-                if extraCond and tagsData["enabled"]:
-                    checkTags = tagsData["tags"]
-                    matchAnyTag = (
-                        tagsData["mode"] == "Any" or tagsData["mode"] == "Blacklist"
-                    )
-                    checkUnmatched = tagsData["mode"] == "Exclusive"
-
+                if isMatch and tagsOn:
                     matched = any(
                         config.matches(tags=checkTags, matchAnyTag=matchAnyTag)
                         != checkUnmatched
                         for config in room.palette.values()
                     )
+                    isMatch = matched != invertTags
 
-                    if tagsData["mode"] == "Blacklist":
-                        extraCond = not matched
-                    elif tagsData["mode"] == "Exclusive":
-                        extraCond = not matched
-                    else:
-                        extraCond = matched
-
-            # Check if the room is the right size
-            if self.filter.sizeData != -1:
-                sizeCond = self.filter.sizeData == room.info.shape
+                # Filter em' out, leaving rooms that don't change alone
+                if room.isHidden() == bool(isMatch):
+                    room.setHidden(not isMatch)
+                if isMatch:
+                    visibleRooms += 1
 
-            # Filter em' out
-            isMatch = IDCond and entityCond and typeCond and sizeCond and extraCond
-            room.setHidden(not isMatch)
+            self.visibleRoomCount = visibleRooms
+        finally:
+            self.list.setUpdatesEnabled(True)
 
         self.handleRoomListDisplayChanged()
 
@@ -3338,29 +3280,26 @@ class RoomSelector(QWidget):
             usedRoomName = room.name
             if extra in room.name and extra != "":
                 extraCount = room.name.count(extra)
-                regSearch = QRegularExpression(" \((\d*)\)")
-                counterMatches = regSearch.match(room.name)
-                if counterMatches.hasMatch():
-                    counter = counterMatches.captured(
-                        counterMatches.lastCapturedIndex()
-                    )
-                    extraCount = extraCount + int(counter)
+                counterMatch = DUPLICATE_COUNTER_REGEX.search(room.name)
+                if counterMatch:
+                    extraCount = extraCount + int(counterMatch.group(1))
                 usedRoomName = room.name.split(extra)[0]
                 extra = extra + " (" + str(extraCount) + ")"
 
+            # spawns and doors are lists of plain values, so copying two levels deep is enough
             r = Room(
-                deepcopy(usedRoomName + extra),
-                deepcopy(room.gridSpawns),
-                deepcopy(room.palette),
-                deepcopy(room.difficulty),
-                deepcopy(room.weight),
-                deepcopy(room.info.type),
-                deepcopy(room.info.variant + v),
-                deepcopy(room.info.subtype),
-                deepcopy(room.info.shape),
-                deepcopy([list(door) for door in room.info.doors]),
+                usedRoomName + extra,
+                [[list(spawn) for spawn in stack] for stack in room.gridSpawns],
+                dict(room.palette),
+                room.difficulty,
+                room.weight,
+                room.info.type,
+                room.info.variant + v,
+                room.info.subtype,
+                room.info.shape,
+                [list(door) for door in room.info.doors],
             )
-            r.xmlProps = deepcopy(room.xmlProps)
+            r.xmlProps = dict(room.xmlProps)
 
             # Mirror the room
             if self.mirror:
@@ -3436,14 +3375,14 @@ class RoomSelector(QWidget):
         return self.list.selectedItems()
 
     def orderedSelectedRooms(self):
+        # the room list only has the one column, so rows alone give the order
         sortedIndexes = sorted(
-            self.list.selectionModel().selectedIndexes(),
-            key=lambda x: (x.column(), x.row()),
+            self.list.selectionModel().selectedIndexes(), key=QModelIndex.row
         )
         return [self.list.itemFromIndex(i) for i in sortedIndexes]
 
     def getRooms(self):
-        return [self.list.item(i) for i in range(self.list.count())]
+        return list(map(self.list.item, range(self.list.count())))
 
 
 # Entity Palette
@@ -3515,8 +3454,33 @@ class EntityGroupItem(QStandardItem):
                 if checkIndex == index:
                     return obj
 
-    def filterView(self, view, shownEntities=None, parentCollapsed=False):
-        hideDuplicateEntities = settings.value("HideDuplicateEntities") == "1"
+    def flatten(self, items):
+        """Writes this group and everything in it into items, at their row index"""
+
+        items[self.startIndex] = self
+
+        row = self.startIndex
+        for obj in self.objects:
+            if isinstance(obj, EntityGroupItem):
+                obj.flatten(items)
+                row = obj.endIndex
+            else:
+                row += 1
+                items[row] = obj
+
+    def filterView(
+        self,
+        view,
+        shownEntities=None,
+        parentCollapsed=False,
+        nameFilter=None,
+        hideDuplicateEntities=None,
+    ):
+        # worked out once at the top and handed down to every nested group
+        if nameFilter is None:
+            nameFilter = view.filter.lower()
+        if hideDuplicateEntities is None:
+            hideDuplicateEntities = settings.value("HideDuplicateEntities") == "1"
 
         if shownEntities is None:
             shownEntities = {}
@@ -3530,7 +3494,7 @@ class EntityGroupItem(QStandardItem):
             if isinstance(item, EntityItem):
                 row += 1
                 hidden = False
-                if view.filter.lower() not in item.name.lower():
+                if nameFilter not in item.lowerName:
                     hidden = True
                 elif hideDuplicateEntities and item.config.uniqueid in shownEntities:
                     hidden = True
@@ -3541,7 +3505,9 @@ class EntityGroupItem(QStandardItem):
                     hasAnyVisible = True
             elif isinstance(item, EntityGroupItem):
                 row = item.endIndex
-                visible = item.filterView(view, shownEntities, collapsed)
+                visible = item.filterView(
+                    view, shownEntities, collapsed, nameFilter, hideDuplicateEntities
+                )
                 hasAnyVisible = hasAnyVisible or visible
 
         if not hasAnyVisible or self.name == "" or parentCollapsed:
@@ -3559,6 +3525,8 @@ class EntityItem(QStandardItem):
         QStandardItem.__init__(self)
 
         self.name = config.name
+        # palette searches compare against this on every keystroke
+        self.lowerName = self.name.lower()
         self.ID = config.type
         self.variant = config.variant
         self.subtype = config.subtype
@@ -3571,18 +3539,38 @@ class EntityItem(QStandardItem):
 class EntityGroupModel(QAbstractListModel):
     """Model containing all the grouped objects in a tileset"""
 
+    # the only roles whose answer depends on the row
+    ITEM_ROLES = frozenset(
+        (Qt.DisplayRole, Qt.DecorationRole, Qt.BackgroundRole, Qt.SizeHintRole)
+    )
+
     def __init__(self, group=None):
         QAbstractListModel.__init__(self)
 
         self.view = None
 
+        # data() hands these out for every row, so they're only made once
+        if not hasattr(EntityGroupModel, "FOREGROUND_BRUSH"):
+            EntityGroupModel.FOREGROUND_BRUSH = QBrush(Qt.black)
+            EntityGroupModel.GROUP_BACKGROUND_BRUSH = QBrush(
+                QColor(165, 165, 165), Qt.Dense4Pattern
+            )
+            font = QFont()
+            font.setPixelSize(16)
+            font.setBold(True)
+            EntityGroupModel.FONT = font
+
         if group is None:
             group = xmlLookups.entities.entityList
 
         self.group = EntityGroupItem(group)
 
+        # the view asks for rows constantly, so look them up directly instead of walking the groups
+        self.items = [None] * (self.group.endIndex + 1)
+        self.group.flatten(self.items)
+
     def rowCount(self, parent=None):
-        return self.group.endIndex + 1
+        return len(self.items)
 
     def flags(self, index):
         item = self.getItem(index.row())
@@ -3593,46 +3581,41 @@ class EntityGroupModel(QAbstractListModel):
             return Qt.ItemIsEnabled | Qt.ItemIsSelectable
 
     def getItem(self, index):
-        return self.group.getItem(index)
+        if 0 <= index < len(self.items):
+            return self.items[index]
+        return None
 
     def data(self, index, role=Qt.DisplayRole):
         # Should return the contents of a row when asked for the index
         #
-        # Can be optimized by only dealing with the roles we need prior
-        # to lookup: Role order is 13, 6, 7, 9, 10, 1, 0, 8
+        # Roles that are the same for every row are answered, or turned away,
+        # prior to lookup: Role order is 13, 6, 7, 9, 10, 1, 0, 8
 
-        if (role > 1) and (role < 6):
-            return None
-
-        elif role == Qt.ForegroundRole:
-            return QBrush(Qt.black)
+        if role == Qt.ForegroundRole:
+            return EntityGroupModel.FOREGROUND_BRUSH
 
         elif role == Qt.TextAlignmentRole:
             return Qt.AlignCenter
 
+        elif role == Qt.FontRole:
+            return EntityGroupModel.FONT
+
+        elif role not in EntityGroupModel.ITEM_ROLES:
+            return None
+
         if not index.isValid():
             return None
         n = index.row()
 
-        if n < 0:
-            return None
-        if n >= self.rowCount():
+        if n < 0 or n >= len(self.items):
             return None
 
-        item = self.getItem(n)
+        item = self.items[n]
 
         if role == Qt.DecorationRole:
             if isinstance(item, EntityItem):
                 return item.icon
 
-        if (
-            role == Qt.ToolTipRole
-            or role == Qt.StatusTipRole
-            or role == Qt.WhatsThisRole
-        ):
-            if isinstance(item, EntityItem):
-                return "{0}".format(item.name)
-
         elif role == Qt.DisplayRole:
             if isinstance(item, EntityGroupItem):
                 return item.name + (" ▶" if item.collapsed else "")
@@ -3643,22 +3626,7 @@ class EntityGroupModel(QAbstractListModel):
 
         elif role == Qt.BackgroundRole:
             if isinstance(item, EntityGroupItem):
-
-                colour = 165
-
-                if colour > 255:
-                    colour = 255
-
-                brush = QBrush(QColor(colour, colour, colour), Qt.Dense4Pattern)
-
-                return brush
-
-        elif role == Qt.FontRole:
-            font = QFont()
-            font.setPixelSize(16)
-            font.setBold(True)
-
-            return font
+                return EntityGroupModel.GROUP_BACKGROUND_BRUSH
 
         return None
 
@@ -3807,10 +3775,7 @@ class EntityList(QListView):
                 QToolTip.showText(event.globalPos(), item.name)
 
     def filterList(self):
-        m = self.model()
-        rows = m.rowCount()
-
-        m.group.filterView(self)
+        self.model().group.filterView(self)
 
 
 class ReplaceDialog(QDialog):
@@ -4804,10 +4769,7 @@ class MainWindow(QMainWindow):
         savedPaths = {}
 
         def fixImage(path):
-            if path not in savedPaths:
-                savedPaths[path] = True
-                formatFix = QImage(path)
-                formatFix.save(path)
+            savedPaths[path] = True
 
         for fixupPath in MainWindow.FIXUP_PNGS:
             dirPath = Path(fixupPath)
@@ -4850,6 +4812,20 @@ class MainWindow(QMainWindow):
                     if imgPath and os.path.isfile(imgPath):
                         fixImage(imgPath)
 
+        def resaveImage(path):
+            try:
+                if not pngNeedsFormatFix(path):
+                    return
+            except OSError:
+                pass
+
+            formatFix = QImage(path)
+            formatFix.save(path)
+
+        # decoding and encoding happen outside the gil, so spread them across threads
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(resaveImage, savedPaths))
+
     def setupFileMenuBar(self):
         f = self.fileMenu
 
@@ -5063,6 +5039,9 @@ class MainWindow(QMainWindow):
         self.roomListDock.setObjectName("RoomListDock")
 
         self.roomList.list.currentItemChanged.connect(self.handleSelectedRoomChanged)
+        self.roomList.list.currentItemChanged.connect(
+            lambda current, prev: self.editor.invalidateStatusOverlay()
+        )
 
         self.addDockWidget(Qt.RightDockWidgetArea, self.roomListDock)
 
@@ -5151,6 +5130,7 @@ class MainWindow(QMainWindow):
     def dirt(self):
         self.setWindowIcon(QIcon("resources/UI/BasementRenovator-SmallDirty.png"))
         self.dirty = True
+        self.editor.invalidateStatusOverlay()
 
     def clean(self):
         self.setWindowIcon(QIcon("resources/UI/BasementRenovator-Small.png"))
@@ -5166,8 +5146,9 @@ class MainWindow(QMainWindow):
         width, height = room.info.dims
 
         for y in range(height):
+            rowStart = y * width
             for e in self.scene.roomRows[y].childItems():
-                spawns[Room.Info.gridIndex(e.entity.x, e.entity.y, width)].append(e)
+                spawns[rowStart + e.entity.x].append(e)
 
         palette = {}
         for i, spawn in enumerate(spawns):
@@ -5812,6 +5793,7 @@ class MainWindow(QMainWindow):
 
         g = settings.value("GridEnabled")
         settings.setValue("GridEnabled", "0")
+        self.scene.loadDisplaySettings()
 
         ScreenshotImage = QImage(
             self.scene.sceneRect().width(),
@@ -5821,6 +5803,8 @@ class MainWindow(QMainWindow):
         ScreenshotImage.fill(Qt.transparent)
 
         RenderPainter = QPainter(ScreenshotImage)
+        # the view normally supplies these to the items
+        RenderPainter.setRenderHints(Entity.RENDER_HINTS)
         self.scene.render(
             RenderPainter, QRectF(ScreenshotImage.rect()), self.scene.sceneRect()
         )
@@ -5832,6 +5816,7 @@ class MainWindow(QMainWindow):
             QApplication.clipboard().setImage(ScreenshotImage, QClipboard.Clipboard)
 
         settings.setValue("GridEnabled", g)
+        self.scene.loadDisplaySettings()
 
     def getTestModPath(self):
         modFolder = findModsPath()
@@ -6263,6 +6248,8 @@ class MainWindow(QMainWindow):
         return resourcesPath
 
     def killIsaac(self):
+        import psutil
+
         for p in psutil.process_iter():
             try:
                 if "isaac" in p.name().lower():
@@ -6498,6 +6485,7 @@ class MainWindow(QMainWindow):
         settings = QSettings("settings.ini", QSettings.IniFormat)
         a, b = onDefault and ("0", "1") or ("1", "0")
         settings.setValue(setting, settings.value(setting) == a and b or a)
+        self.scene.loadDisplaySettings()
         self.scene.update()
 
     # @pyqtSlot()
@@ -5,6 +5,8 @@ from pathlib import Path
 from PyQt5.QtCore import QRect, QPoint
 from PyQt5.QtGui import QTransform, QImage, QPainter
 
+RESOURCES_PREFIX_REGEX = re.compile(r".*resources")
+
 
 class Config:
     def __init__(self, anmPath, resourcePath):
@@ -106,7 +108,7 @@ class Config:
                 image = os.path.abspath(os.path.join(self.dir, image))
                 imgPath = Path(image)
                 if not (imgPath and imgPath.exists()):
-                    image = re.sub(r".*resources", self.resourcePath, image)
+                    image = RESOURCES_PREFIX_REGEX.sub(self.resourcePath, image)
                     imgPath = Path(image)
                     image = str(imgPath) if imgPath.exists() else None
 
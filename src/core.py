@@ -1,4 +1,30 @@
+import itertools
+
+
 class Entity:
+    # one per spawn when converting whole files, so skip the per-instance dict
+    __slots__ = (
+        "x",
+        "y",
+        "weight",
+        "xmlProps",
+        "Type",
+        "Variant",
+        "Subtype",
+        "name",
+        "isGridEnt",
+        "baseHP",
+        "boss",
+        "champion",
+        "pixmap",
+        "known",
+        "invalid",
+        "placeVisual",
+        "blocksDoor",
+        "mirrorX",
+        "mirrorY",
+    )
+
     def __init__(self, x=0, y=0, t=0, v=0, s=0, weight=0, xmlProps=None):
         # Supplied entity info
         self.x = x
@@ -210,18 +236,34 @@ class Room:
     }
 
     for shape in Shapes.values():
-        doorWalls = shape["DoorWalls"] = []
+        doorWalls = []
+        # the tile just inside each door, for inFrontOfDoor
+        doorFronts = shape["DoorFronts"] = {}
         for door in shape["Doors"]:
             door.append(True)
             for wall in shape["Walls"]["X"]:
                 if door[0] >= wall[0] and door[0] <= wall[1] and door[1] == wall[2]:
                     doorWalls.append((door, wall, "X"))
+                    doorFronts.setdefault((door[0], door[1] + wall[3]), door)
                     break
             for wall in shape["Walls"]["Y"]:
                 if door[1] >= wall[0] and door[1] <= wall[1] and door[0] == wall[2]:
                     doorWalls.append((door, wall, "Y"))
+                    doorFronts.setdefault((door[0] + wall[3], door[1]), door)
+        shape["DoorWalls"] = tuple(doorWalls)
 
     class Info:
+        # one per room, and files can hold thousands of them
+        __slots__ = (
+            "type",
+            "variant",
+            "subtype",
+            "_shape",
+            "shapeData",
+            "baseShapeData",
+            "doors",
+        )
+
         def __init__(self, t=0, v=0, s=0, shape=1):
             self.type = t
             self.variant = v
@@ -274,19 +316,19 @@ class Room:
             return a < wmin or a > wmax or ((c > wlvl) - (c < wlvl)) == wdir
 
         def inFrontOfDoor(self, x, y):
-            for door, wall, axis in self.shapeData["DoorWalls"]:
-                if axis == "X" and door[0] == x and y - door[1] == wall[3]:
-                    return door
-                if axis == "Y" and door[1] == y and x - door[0] == wall[3]:
-                    return door
-            return None
+            return self.shapeData["DoorFronts"].get((x, y))
 
         def isInBounds(self, x, y):
-            return all(
-                Room.Info._axisBounds(x, y, w) for w in self.shapeData["Walls"]["X"]
-            ) and all(
-                Room.Info._axisBounds(y, x, w) for w in self.shapeData["Walls"]["Y"]
-            )
+            # walls never change for a shape, so each tile is only tested once
+            inBounds = self.shapeData.setdefault("InBounds", {})
+            res = inBounds.get((x, y))
+            if res is None:
+                res = inBounds[(x, y)] = all(
+                    Room.Info._axisBounds(x, y, w) for w in self.shapeData["Walls"]["X"]
+                ) and all(
+                    Room.Info._axisBounds(y, x, w) for w in self.shapeData["Walls"]["Y"]
+                )
+            return res
 
         def snapToBounds(self, x, y, dist=1):
             for w in self.shapeData["Walls"]["X"]:
@@ -299,6 +341,38 @@ class Room:
 
             return (x, y)
 
+        def wallSnapOffset(self, x, y):
+            # walls never change for a shape, so each tile's offset is only worked out once
+            snapOffsets = self.shapeData.setdefault("WallSnap", {})
+            offset = snapOffsets.get((x, y))
+            if offset is not None:
+                return offset
+
+            walls = self.shapeData["Walls"]
+            distancesY = [
+                ((x < w[0] or x > w[1]) and 100000 or abs(y - w[2]), w)
+                for w in walls["X"]
+            ]
+            distancesX = [
+                ((y < w[0] or y > w[1]) and 100000 or abs(x - w[2]), w)
+                for w in walls["Y"]
+            ]
+
+            closestY = min(distancesY, key=lambda w: w[0])
+            closestX = min(distancesX, key=lambda w: w[0])
+
+            # TODO match up with game when distances are equal
+            wx, wy = 0, 0
+            if closestY[0] < closestX[0]:
+                w = closestY[1]
+                wy = w[2] - y
+            else:
+                w = closestX[1]
+                wx = (w[2] - x) * 2
+
+            offset = snapOffsets[(x, y)] = (wx, wy)
+            return offset
+
     def __init__(
         self,
         name="New Room",
@@ -338,10 +412,8 @@ class Room:
     def gridSpawns(self, g):
         self._gridSpawns = g
 
-        self._spawnCount = 0
-        for entStack in self.gridSpawns:
-            if entStack:
-                self._spawnCount += 1
+        # number of occupied tiles, counted without stepping through the empty ones in python
+        self._spawnCount = sum(map(bool, g))
 
     DoorSortKey = lambda door: (door[0], door[1])
 
@@ -373,31 +445,18 @@ class Room:
     def getPrefix(self):
         return Room.getDesc(self.info, self.name, self.difficulty, self.weight)
 
-    class _SpawnIter:
-        def __init__(self, gridSpawns, dims):
-            self.idx = -1
-            self.spawns = gridSpawns
-            self.width, self.height = dims
-
-        def __iter__(self):
-            return self
-
-        def __next__(self):
-            stack = None
-            while True:
-                self.idx += 1
-                if self.idx >= self.width * self.height or self.idx >= len(self.spawns):
-                    raise StopIteration
-
-                stack = self.spawns[self.idx]
-                if stack:
-                    break
-            x = int(self.idx % self.width)
-            y = int(self.idx / self.width)
-            return (stack, x, y)
-
     def spawns(self):
-        return Room._SpawnIter(self.gridSpawns, self.info.dims)
+        # bound now rather than on first iteration, reshape iterates the old layout after changing shape
+        width, height = self.info.dims
+        gridSpawns = self.gridSpawns
+
+        # most tiles are empty, so let compress skip past them rather than checking each one here
+        return (
+            (gridSpawns[idx], idx % width, idx // width)
+            for idx in itertools.compress(
+                range(min(width * height, len(gridSpawns))), gridSpawns
+            )
+        )
 
 
 class File:
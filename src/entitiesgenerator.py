@@ -1,15 +1,51 @@
-import xml.etree.cElementTree as ET
-from xml.dom import minidom
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from xml.dom import minidom
 
 import src.anm2 as anm2
-from src.util import linuxPathSensitivityTraining, printf
+from src.util import clearListingCaches, linuxPathSensitivityTraining, printf
+
+# lxml is much faster at parsing the (potentially huge) mod xmls, fall back on the
+# standard library if it isn't installed
+try:
+    import lxml.etree as ET
+
+    # the standard library parser drops comments, match that so they don't show up as nodes
+    MOD_XML_PARSER = ET.XMLParser(remove_comments=True)
+except ImportError:
+    import xml.etree.cElementTree as ET
+
+    MOD_XML_PARSER = None
+
+ModXMLParseError = ET.ParseError
+
+MOD_NAME_CLEAN_REGEX = re.compile(r"[^\w\d]")
+
+# icon rendering is mostly image decoding and png encoding, which qt does outside the gil
+ICON_RENDER_WORKERS = os.cpu_count() or 1
+
+
+def parseModXML(path):
+    """Parses an xml file provided by a mod, raises ModXMLParseError if it is malformed"""
+    return ET.parse(path, MOD_XML_PARSER).getroot()
+
+
+def renderIcon(anmPath, resourcePath, filename):
+    """Renders the last frame of the default animation to filename, returns False if there was nothing to render"""
+    anim = anm2.Config(anmPath, resourcePath)
+    anim.setAnimation()
+    anim.frame = anim.animLen - 1
+    img = anim.render()
+    if not img:
+        return False
+
+    img.save(filename, "PNG")
+    return True
 
 
 def generateXMLFromEntities2(modPath, modName, entities2Root, resourcePath):
-    cleanUp = re.compile(r"[^\w\d]")
-    outputDir = f"resources/Entities/ModTemp/{cleanUp.sub('', modName)}"
+    outputDir = f"resources/Entities/ModTemp/{MOD_NAME_CLEAN_REGEX.sub('', modName)}"
     if not os.path.isdir(outputDir):
         os.mkdir(outputDir)
 
@@ -58,23 +94,11 @@ def generateXMLFromEntities2(modPath, modName, entities2Root, resourcePath):
                 printf("Skipping: Invalid anm2!")
                 return None
 
-        anim = anm2.Config(anmPath, resourcePath)
-        anim.setAnimation()
-        anim.frame = anim.animLen - 1
-        img = anim.render()
-
-        filename = "resources/Entities/questionmark.png"
-        if img:
-            # Save it to a Temp file - better than keeping it in memory for user retrieval purposes?
-            resDir = os.path.join(outputDir, "icons")
-            if not os.path.isdir(resDir):
-                os.mkdir(resDir)
-            filename = os.path.join(
-                resDir, f'{en.get("id")}.{v}.{s} - {en.get("name")}.png'
-            )
-            img.save(filename, "PNG")
-        else:
-            printf(f"Could not render icon for entity {i}.{v}.{s}, anm2 path:", anmPath)
+        # Save it to a Temp file - better than keeping it in memory for user retrieval purposes?
+        # the icon is rendered later, falling back to the question mark if that fails
+        filename = os.path.join(
+            resDir, f'{en.get("id")}.{v}.{s} - {en.get("name")}.png'
+        )
 
         # Write the modded entity to the entityXML temporarily for runtime
         entityTemp = ET.Element("entity")
@@ -109,14 +133,46 @@ def generateXMLFromEntities2(modPath, modName, entities2Root, resourcePath):
         else:
             entityTemp.set("Kind", "Enemies")
 
+        # duplicate rows share a filename, render it once so threads never write it together
+        icons.setdefault(filename, (anmPath, []))[1].append(entityTemp)
         return entityTemp
 
+    resDir = os.path.join(outputDir, "icons")
+    icons = {}
     result = list(filter(lambda x: x is not None, map(mapEn, enList)))
 
+    if icons and not os.path.isdir(resDir):
+        os.mkdir(resDir)
+
+    with ThreadPoolExecutor(max_workers=ICON_RENDER_WORKERS) as pool:
+        rendered = pool.map(
+            lambda icon: renderIcon(icon[1][0], resourcePath, icon[0]),
+            icons.items(),
+        )
+        for (anmPath, entityTemps), success in zip(icons.values(), rendered):
+            if success:
+                continue
+
+            for entityTemp in entityTemps:
+                printf(
+                    f'Could not render icon for entity {entityTemp.get("ID")}.{entityTemp.get("Variant")}.{entityTemp.get("Subtype")}, anm2 path:',
+                    anmPath,
+                )
+                entityTemp.set("Image", "resources/Entities/questionmark.png")
+
+    # the icons directory may have been listed before these were written
+    clearListingCaches()
+
     outputRoot = ET.Element("data")
     outputRoot.extend(result)
-    with open(os.path.join(outputDir, "EntitiesMod.xml"), "w") as out:
+    # lxml and the standard library from 3.9 can indent in place, older versions have
+    # to reparse with minidom for pretty printing
+    if hasattr(ET, "indent"):
+        ET.indent(outputRoot, space="    ")
+        xml = ET.tostring(outputRoot, encoding="unicode") + "\n"
+    else:
         xml = minidom.parseString(ET.tostring(outputRoot)).toprettyxml(indent="    ")
+    with open(os.path.join(outputDir, "EntitiesMod.xml"), "w") as out:
         s = str.replace(xml, outputDir + os.path.sep, "").replace(os.path.sep, "/")
         out.write(s)
 
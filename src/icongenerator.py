@@ -1,20 +1,26 @@
 """
 Generates icons for BR from an anm2 file
 """
-import os, platform, re
+import os, platform
 
 import anm2
 
 from PyQt5.QtCore import QSettings, QFile, QDir, QCommandLineOption, QCommandLineParser
 from PyQt5.QtWidgets import QMessageBox, QApplication, QFileDialog
 
+if not __package__:
+    from util import readModdingDataPath, steamLibraryFolders
+else:
+    from src.util import readModdingDataPath, steamLibraryFolders
+
 
 def findInstallPath():
     installPath = ""
     cantFindPath = False
 
-    if QFile.exists(settings.value("InstallFolder")):
-        installPath = settings.value("InstallFolder")
+    installFolder = settings.value("InstallFolder")
+    if QFile.exists(installFolder):
+        installPath = installFolder
 
     else:
         # Windows path things
@@ -31,21 +37,13 @@ def findInstallPath():
             if not QFile.exists(installPath):
                 cantFindPath = True
 
-                libconfig = os.path.join(basePath, "steamapps", "libraryfolders.vdf")
-                if os.path.isfile(libconfig):
-                    libLines = list(open(libconfig, "r"))
-                    matcher = re.compile(r'"\d+"\s*"(.*?)"')
-                    installDirs = map(
-                        lambda res: os.path.normpath(res.group(1)),
-                        filter(lambda res: res, map(matcher.search, libLines)),
+                for root in steamLibraryFolders(basePath):
+                    installPath = os.path.join(
+                        root, "steamapps", "common", "The Binding of Isaac Rebirth"
                     )
-                    for root in installDirs:
-                        installPath = os.path.join(
-                            root, "steamapps", "common", "The Binding of Isaac Rebirth"
-                        )
-                        if QFile.exists(installPath):
-                            cantFindPath = False
-                            break
+                    if QFile.exists(installPath):
+                        cantFindPath = False
+                        break
 
         # Mac Path things
         elif "Darwin" in platform.system():
@@ -81,23 +79,14 @@ def findModsPath(installPath=None):
     modsPath = ""
     cantFindPath = False
 
-    if QFile.exists(settings.value("ModsFolder")):
-        modsPath = settings.value("ModsFolder")
+    modsFolder = settings.value("ModsFolder")
+    if QFile.exists(modsFolder):
+        modsPath = modsFolder
 
     else:
         installPath = installPath or findInstallPath()
         if len(installPath) > 0:
-            modd = os.path.join(installPath, "savedatapath.txt")
-            if os.path.isfile(modd):
-                lines = list(open(modd, "r"))
-                modDirs = list(
-                    filter(
-                        lambda parts: parts[0] == "Modding Data Path",
-                        map(lambda line: line.split(": "), lines),
-                    )
-                )
-                if len(modDirs) > 0:
-                    modsPath = os.path.normpath(modDirs[0][1].strip())
+            modsPath = readModdingDataPath(installPath) or ""
 
     if modsPath == "" or not os.path.isdir(modsPath):
         cantFindPath = True
@@ -2,12 +2,17 @@ import xml.etree.cElementTree as ET
 import os
 import abc
 import re
+import functools
 
 from itertools import zip_longest
 
 from src.constants import *
 from src.util import *
-from src.entitiesgenerator import generateXMLFromEntities2
+from src.entitiesgenerator import (
+    generateXMLFromEntities2,
+    parseModXML,
+    ModXMLParseError,
+)
 
 
 def loadXMLFile(path):
@@ -25,11 +30,14 @@ def loadXMLFile(path):
     return root
 
 
+CRITERIA_SPLIT_REGEX = re.compile(r"[\[\(\)\],]")
+
+
 def parseCriteria(txt):
     if not txt:
         return None
 
-    tokens = list(filter(bool, re.split(r"[\[\(\)\],]", txt)))
+    tokens = list(filter(bool, CRITERIA_SPLIT_REGEX.split(txt)))
 
     if txt[0] in ["[", "("]:
         start, end = txt[0], txt[-1]
@@ -126,6 +134,8 @@ class Lookup(metaclass=abc.ABCMeta):
 class StageLookup(Lookup):
     def __init__(self, version, parent):
         self.xml = None
+        # stage nodes by name, in place of searching the tree for each stage a mod replaces
+        self.stagesByName = {}
         super().__init__("Stages", version)
         self.parent = parent
 
@@ -144,6 +154,7 @@ class StageLookup(Lookup):
         if self.xml is None:
             self.xml = root
             initialLoad = True
+            self.indexStages(stageList)
 
         def mapStage(stage):
             name = stage.get("Name")
@@ -154,7 +165,7 @@ class StageLookup(Lookup):
             if self.parent.verbose:
                 print("Loading stage:", str(stage.attrib))
 
-            replacement = self.xml.find(f'stage[@Name="{name}"]')
+            replacement = self.stagesByName.get(name)
 
             if replacement is None and (
                 stage.get("Stage") is None or stage.get("StageType") is None
@@ -185,6 +196,14 @@ class StageLookup(Lookup):
         stages = list(filter(lambda x: x is not None, map(mapStage, stageList)))
         if stages and not initialLoad:
             self.xml.extend(stages)
+            self.indexStages(stages)
+
+    def indexStages(self, stages):
+        # the first stage with a name is the one that gets replaced
+        for stage in stages:
+            name = stage.get("Name")
+            if name is not None:
+                self.stagesByName.setdefault(name, stage)
 
     def lookup(
         self, path=None, name=None, stage=None, stageType=None, baseGamePath=None
@@ -225,6 +244,8 @@ class StageLookup(Lookup):
 class RoomTypeLookup(Lookup):
     def __init__(self, version, parent):
         self.xml = None
+        # room type nodes by name, in place of searching the tree for each room type a mod replaces
+        self.roomTypesByName = {}
         super().__init__("RoomTypes", version)
         self.parent = parent
 
@@ -243,6 +264,7 @@ class RoomTypeLookup(Lookup):
         if self.xml is None:
             self.xml = root
             initialLoad = True
+            self.indexRoomTypes(roomTypeList)
 
         def mapRoomType(roomType):
             name = roomType.get("Name")
@@ -253,7 +275,7 @@ class RoomTypeLookup(Lookup):
                 )
                 return None
 
-            replacement = self.xml.find(f'room[@Name="{name}"]')
+            replacement = self.roomTypesByName.get(name)
 
             sanitizePath(roomType, "Icon", mod.resourcePath)
 
@@ -275,6 +297,14 @@ class RoomTypeLookup(Lookup):
         )
         if roomTypes and not initialLoad:
             self.xml.extend(roomTypes)
+            self.indexRoomTypes(roomTypes)
+
+    def indexRoomTypes(self, roomTypes):
+        # the first room type with a name is the one that gets replaced
+        for roomType in roomTypes:
+            name = roomType.get("Name")
+            if name is not None:
+                self.roomTypesByName.setdefault(name, roomType)
 
     def filterRoom(self, node, room, path=None):
         typeF = node.get("Type")
@@ -375,6 +405,9 @@ class EntityLookup(Lookup):
 
                 self.offset = offset
                 self.length = length
+                # fixed per element, so get/set are just a shift and a mask
+                self.mask = bitFill(length)
+                self.clearMask = ~(self.mask << offset)
 
                 self.valueoffset = float(node.get("ValueOffset", 0))
                 self.floatvalueoffset = self.valueoffset % 1
@@ -405,14 +438,10 @@ class EntityLookup(Lookup):
                         self.dropdownvalues.append(int(value.get("Value", i)))
 
             def getRawValue(self, number):
-                number = bitGet(number, self.offset, self.length)
-
-                return number
+                return (number >> self.offset) & self.mask
 
             def setRawValue(self, number, value):
-                number = bitSet(number, value, self.offset, self.length)
-
-                return number
+                return (number & self.clearMask) | ((value & self.mask) << self.offset)
 
             def getRawValueFromWidgetValue(self, widgetValue):
                 if self.dropdownvalues:
@@ -559,6 +588,8 @@ class EntityLookup(Lookup):
             self.tags = {}
             self.uniqueid = -1
             self.tagsString = "[]"
+            # (type, variant, subtype) and wildcard flag it was indexed under, once added
+            self.lookupKey = None
 
         def getTagConfig(self, tag):
             if not self.parent:
@@ -598,7 +629,7 @@ class EntityLookup(Lookup):
                 os.path.join(resourcePath, imagePath)
             )
 
-            if not os.path.exists(imagePath):
+            if imagePath is None or not cachedPathExists(imagePath):
                 printf(
                     f"Failed loading image for Entity {self.name} ({self.type}.{self.variant}.{self.subtype}):",
                     imagePath,
@@ -640,6 +671,14 @@ class EntityLookup(Lookup):
 
         ENTITY_CLEAN_NAME_REGEX = re.compile(r"[^\w\d]")
 
+        # the same names get compared over and over when loading several mods
+        @staticmethod
+        @functools.lru_cache(maxsize=4096)
+        def cleanEntityName(name):
+            return EntityLookup.EntityConfig.ENTITY_CLEAN_NAME_REGEX.sub(
+                "", name
+            ).lower()
+
         def getEntities2Node(self):
             if (
                 not self.mod
@@ -649,15 +688,13 @@ class EntityLookup(Lookup):
                 return None, False, None
 
             adjustedId = 1000 if self.type == 999 else self.type
-            query = f"entity[@id='{adjustedId}'][@variant='{self.variant}']"
+            key = (str(adjustedId), str(self.variant))
 
             validMissingSubtype = False
-            entityXML = self.mod.entities2root.find(
-                query + f"[@subtype='{self.subtype}']"
-            )
+            entityXML = self.mod.entities2BySubtype.get(key + (str(self.subtype),))
 
             if entityXML is None:
-                entityXML = self.mod.entities2root.find(query)
+                entityXML = self.mod.entities2ByVariant.get(key)
                 validMissingSubtype = entityXML is not None
 
             if entityXML is None:
@@ -665,12 +702,8 @@ class EntityLookup(Lookup):
             else:
                 foundName = entityXML.get("name")
                 givenName = self.name
-                foundNameClean, givenNameClean = list(
-                    map(
-                        lambda s: self.ENTITY_CLEAN_NAME_REGEX.sub("", s).lower(),
-                        (foundName, givenName),
-                    )
-                )
+                foundNameClean = self.cleanEntityName(foundName)
+                givenNameClean = self.cleanEntityName(givenName)
                 if not (
                     foundNameClean == givenNameClean
                     or (
@@ -769,8 +802,9 @@ class EntityLookup(Lookup):
             ):
                 self.addTag("Champion")
 
-            if node.get("PlaceVisual"):
-                self.placeVisual = node.get("PlaceVisual")
+            placeVisual = node.get("PlaceVisual")
+            if placeVisual:
+                self.placeVisual = parsePlaceVisual(placeVisual)
 
             if node.get("Invalid"):
                 self.invalid = True
@@ -933,11 +967,13 @@ class EntityLookup(Lookup):
 
             self.entries = []
             self.groupentries = []
+            self.groupentriesByName = {}
 
         def addEntry(self, entry):
             self.entries.append(entry)
             if isinstance(entry, EntityLookup.GroupConfig):
                 self.groupentries.append(entry)
+                self.groupentriesByName.setdefault(entry.name, entry)
 
     class TabConfig(GroupConfig):
         def __init__(self, node=None, name=None):
@@ -966,6 +1002,13 @@ class EntityLookup(Lookup):
     def __init__(self, version, parent):
         self.entityList = self.GroupConfig()
         self.entityListByType = {}
+        # entities by their exact (type, variant, subtype), and by type for the ones
+        # whose bitfields let them match any variant or subtype
+        self.entityListByKey = {}
+        self.entityWildcardsByType = {}
+        # lookupOne results by (type, variant, subtype), cleared whenever an entity is
+        # added and at the start of every loadEntityNode
+        self.lookupOneCache = {}
         self.groups = {}
         self.tags = {}
         self.tabs = []
@@ -977,6 +1020,7 @@ class EntityLookup(Lookup):
         return len(self.entityList.entries)
 
     def addEntity(self, entity: EntityConfig):
+        self.lookupOneCache.clear()
         self.lastuniqueid += 1
         entity.uniqueid = self.lastuniqueid
         self.entityList.addEntry(entity)
@@ -986,7 +1030,33 @@ class EntityLookup(Lookup):
 
         self.entityListByType[entity.type].append(entity)
 
+        self.indexEntity(entity)
+
+    def indexEntity(self, entity: EntityConfig):
+        key = (entity.type, entity.variant, entity.subtype)
+        self.entityListByKey.setdefault(key, []).append(entity)
+
+        wildcard = entity.hasBitfieldKey("Variant") or entity.hasBitfieldKey("Subtype")
+        if wildcard:
+            self.entityWildcardsByType.setdefault(entity.type, []).append(entity)
+
+        entity.lookupKey = (key, wildcard)
+
+    def reindexEntity(self, entity: EntityConfig):
+        """Call after changing an added entity's ids or bitfields in place"""
+        # lookupOneCache isn't touched here, loadEntityNode already cleared it before
+        # the entity was modified
+        key, wildcard = entity.lookupKey
+        self.entityListByKey[key].remove(entity)
+        if wildcard:
+            self.entityWildcardsByType[key[0]].remove(entity)
+
+        self.indexEntity(entity)
+
     def loadEntityNode(self, node: ET.Element, mod, parentGroup=None):
+        # overwrites and refs modify existing configs in place
+        self.lookupOneCache.clear()
+
         entityType = node.get("ID")
         variant = node.get("Variant")
         subtype = node.get("Subtype")
@@ -1061,6 +1131,8 @@ class EntityLookup(Lookup):
 
             if not overwrite:
                 self.addEntity(entityConfig)
+            elif entityConfig.lookupKey is not None:
+                self.reindexEntity(entityConfig)
 
         groups = []
         nodeKind = node.get("Kind")
@@ -1077,12 +1149,7 @@ class EntityLookup(Lookup):
             groupName = f"({kind}) {group}"
             tab = self.getTab(name=kind)
 
-            groupConfig = None
-            for entry in tab.entries:
-                if isinstance(entry, self.GroupConfig) and entry.name == groupName:
-                    groupConfig = entry
-                    break
-
+            groupConfig = tab.groupentriesByName.get(groupName)
             if groupConfig is None:
                 groupConfig = self.getGroup(name=groupName, label=group)
                 tab.addEntry(groupConfig)
@@ -1202,7 +1269,7 @@ class EntityLookup(Lookup):
             f"Successfully loaded {self.count() - previous} new Entities from {mod.name}"
         )
 
-    def lookup(
+    def lookupIter(
         self,
         entitytype=None,
         variant=None,
@@ -1217,20 +1284,32 @@ class EntityLookup(Lookup):
                 if entitytype in self.entityListByType:
                     entities = self.entityListByType[entitytype]
                 else:
-                    return []
+                    return iter(())
             else:
                 entities = self.entityList.entries
 
-        entities = list(
-            filter(
-                lambda entity: entity.matches(
-                    entitytype, variant, subtype, name, tags, matchAnyTag
-                ),
-                entities,
-            )
+        return filter(
+            lambda entity: entity.matches(
+                entitytype, variant, subtype, name, tags, matchAnyTag
+            ),
+            entities,
         )
 
-        return entities
+    def lookup(
+        self,
+        entitytype=None,
+        variant=None,
+        subtype=None,
+        name=None,
+        tags=None,
+        matchAnyTag=False,
+        entities=None,
+    ):
+        return list(
+            self.lookupIter(
+                entitytype, variant, subtype, name, tags, matchAnyTag, entities
+            )
+        )
 
     def lookupOne(
         self,
@@ -1242,11 +1321,39 @@ class EntityLookup(Lookup):
         matchAnyTag=False,
         entities=None,
     ):
-        entities = self.lookup(
-            entitytype, variant, subtype, name, tags, matchAnyTag, entities
-        )
+        cacheable = name is None and tags is None and entities is None
+        if cacheable:
+            key = (entitytype, variant, subtype)
+            if key in self.lookupOneCache:
+                return self.lookupOneCache[key]
+
+        if (
+            cacheable
+            and entitytype is not None
+            and variant is not None
+            and subtype is not None
+        ):
+            # an exact match or a bitfield wildcard, whichever was added first; this is
+            # what scanning the type's list in order finds, without checking every entity of the type
+            candidates = list(self.entityListByKey.get(key, ()))
+            candidates.extend(
+                entity
+                for entity in self.entityWildcardsByType.get(entitytype, ())
+                if entity.matches(entitytype, variant, subtype)
+            )
+            entity = min(candidates, key=lambda entity: entity.uniqueid, default=None)
+        else:
+            # only the first match is wanted, so stop checking entities once it turns up
+            entity = next(
+                self.lookupIter(
+                    entitytype, variant, subtype, name, tags, matchAnyTag, entities
+                ),
+                None,
+            )
+        if cacheable:
+            self.lookupOneCache[key] = entity
 
-        return next(iter(entities), None)
+        return entity
 
 
 class MainLookup:
@@ -1333,15 +1440,26 @@ class MainLookup:
             self.autogenerateContent = autogenerateContent
 
             self.entities2root = None
+            self.entities2BySubtype = {}
+            self.entities2ByVariant = {}
             if self.modPath:
                 entities2Path = os.path.join(modPath, "content/entities2.xml")
                 if os.path.exists(entities2Path):
                     try:
-                        self.entities2root = ET.parse(entities2Path).getroot()
-                    except ET.ParseError as e:
+                        self.entities2root = parseModXML(entities2Path)
+                    except ModXMLParseError as e:
                         printf(f'ERROR parsing entities2 xml for mod "{modName}": {e}')
                         return
 
+                    self.indexEntities2()
+
+        def indexEntities2(self):
+            """Indexes entities2 nodes by id/variant(/subtype), keeping the first match like find() would"""
+            for node in self.entities2root.findall("entity"):
+                key = (node.get("id"), node.get("variant"))
+                self.entities2ByVariant.setdefault(key, node)
+                self.entities2BySubtype.setdefault(key + (node.get("subtype"),), node)
+
     def __init__(self, version, verbose):
         self.basemod = self.ModConfig()
         self.stages = StageLookup(version, self)
@@ -1350,9 +1468,13 @@ class MainLookup:
         self.version = version
         self.verbose = verbose
 
+        # image paths are checked against cached listings, don't trust ones from an earlier load
+        clearListingCaches()
         self.loadXML(loadXMLFile("resources/Versions.xml"), self.basemod)
 
     def loadFromMod(self, modPath, brPath, name, autogenerateContent):
+        # the mod's folders may have changed since they were last listed
+        clearListingCaches()
         modConfig = self.ModConfig(name, brPath, modPath, autogenerateContent)
         versionsPath = os.path.join(brPath, "VersionsMod.xml")
         if os.path.exists(versionsPath):
@@ -1,5 +1,7 @@
 import os
+import re
 import math
+import functools
 
 
 def printf(*args):
@@ -26,24 +28,139 @@ def bitSet(bits, sourceBits, startBit, count):
     return bits | sourceBits
 
 
+@functools.lru_cache(maxsize=256)
+def caseInsensitiveListing(directory):
+    """Maps the lowercased names in a directory to their actual names, first match wins"""
+    return {item.lower(): item for item in reversed(os.listdir(directory))}
+
+
+@functools.lru_cache(maxsize=256)
+def directoryListing(directory):
+    """The names in a directory, listed once rather than stat'ing each file in it"""
+    return frozenset(os.listdir(directory or "."))
+
+
+def cachedPathExists(path):
+    directory, file = os.path.split(os.path.normpath(path))
+    # listing errors aren't cached, the directory may be created later
+    try:
+        return file in directoryListing(directory)
+    except OSError:
+        return False
+
+
+def clearListingCaches():
+    """Forgets the cached directory listings, call before loading files that may have changed on disk"""
+    directoryListing.cache_clear()
+    caseInsensitiveListing.cache_clear()
+
+
 def linuxPathSensitivityTraining(path):
 
     path = path.replace("\\", "/")
 
+    # most paths are already cased correctly, skip listing the directory for those
+    if cachedPathExists(path):
+        return os.path.normpath(path)
+
     directory, file = os.path.split(os.path.normpath(path))
 
     if not os.path.isdir(directory):
         return None
 
-    contents = os.listdir(directory)
-
-    for item in contents:
-        if item.lower() == file.lower():
-            return os.path.normpath(os.path.join(directory, item))
+    item = caseInsensitiveListing(directory).get(file.lower())
+    if item is not None:
+        return os.path.normpath(os.path.join(directory, item))
 
     return os.path.normpath(path)
 
 
+# library folders are listed as "<index>" "<path>" pairs on a single line
+STEAM_LIBRARY_FOLDER_REGEX = re.compile(r'"\d+"[ \t]*"(.*?)"')
+
+
+def steamLibraryFolders(steamPath):
+    """The library folders listed in steam's libraryfolders.vdf, empty if there isn't one"""
+    libconfig = os.path.join(steamPath, "steamapps", "libraryfolders.vdf")
+    if not os.path.isfile(libconfig):
+        return []
+
+    with open(libconfig, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    return [
+        os.path.normpath(match.group(1))
+        for match in STEAM_LIBRARY_FOLDER_REGEX.finditer(content)
+    ]
+
+
+def readModdingDataPath(installPath):
+    """The mods folder the game recorded in savedatapath.txt, or None if it didn't"""
+    saveDataPath = os.path.join(installPath, "savedatapath.txt")
+    if not os.path.isfile(saveDataPath):
+        return None
+
+    with open(saveDataPath, "r") as f:
+        modDir = next(
+            (
+                line.split(": ")[1]
+                for line in f
+                if line.startswith("Modding Data Path: ")
+            ),
+            None,
+        )
+
+    if modDir is None:
+        return None
+
+    return os.path.normpath(modDir.strip())
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# chunks libpng reads without complaint, anything else (mainly iCCP profiles and cHRM) may warn
+PLAIN_PNG_CHUNKS = {
+    b"IHDR",
+    b"PLTE",
+    b"tRNS",
+    b"sRGB",
+    b"gAMA",
+    b"pHYs",
+    b"tEXt",
+    b"zTXt",
+    b"iTXt",
+    b"tIME",
+}
+
+
+def pngNeedsFormatFix(path):
+    """Checks the chunk headers of a png for anything that would make libpng emit warnings"""
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return True
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return True
+
+            length = int.from_bytes(header[:4], "big")
+            chunkType = header[4:]
+            if chunkType in (b"IDAT", b"IEND"):
+                return False
+
+            if chunkType not in PLAIN_PNG_CHUNKS:
+                return True
+
+            if chunkType == b"IHDR":
+                data = f.read(length)
+                # interlaced images warn too
+                if len(data) < 13 or data[12] != 0:
+                    return True
+                f.seek(4, os.SEEK_CUR)
+            else:
+                f.seek(length + 4, os.SEEK_CUR)
+
+
 def sanitizePath(node, key, path):
     prefix = node.get(key)
     if prefix is not None:
@@ -59,6 +176,16 @@ def checkFloat(s):
         return False
 
 
+# the same few PlaceVisual strings come up for every entity and gfx override using them
+@functools.lru_cache(maxsize=256)
+def parsePlaceVisual(placeVisual):
+    parts = [x.strip() for x in placeVisual.split(",")]
+    if len(parts) == 2 and checkFloat(parts[0]) and checkFloat(parts[1]):
+        return (float(parts[0]), float(parts[1]))
+
+    return parts[0]
+
+
 def checkInt(s):
     if checkFloat(s):
         return int(s) == float(s)